@@ -10,6 +10,8 @@ from pathlib import Path
 from typing import List, Tuple, Dict
 import csv
 
+import numpy as np
+
 from .data_manager import get_data_path
 
 
@@ -58,3 +60,14 @@ def build_constellation_segments(stars: Dict[int, object],
             segments.append((s1, s2))
     return segments
 
+
+def constellation_edge_ids(lines: List[ConstellationLine]) -> np.ndarray:
+    """Return the star id pairs of `lines` as an (M, 2) int64 array.
+
+    Built once per catalog; views map the ids to rows of their visible stars.
+    """
+    edges = np.empty((len(lines), 2), dtype=np.int64)
+    for i, ln in enumerate(lines):
+        edges[i, 0] = ln.star_id_1
+        edges[i, 1] = ln.star_id_2
+    return edges
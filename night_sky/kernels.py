@@ -0,0 +1,191 @@
+"""Optional Numba-compiled kernels for the sky views.
+
+Numba is not a required dependency. Each ``*_kernel()`` accessor returns a
+compiled function when Numba can be imported and ``None`` otherwise, so
+callers keep their NumPy code path as the fallback. The import (and the JIT
+compile) is deferred until a kernel is first requested, keeping application
+start-up unaffected.
+
+The plain-Python bodies below are the reference implementations that get
+compiled; they are also usable (slowly) without Numba, e.g. in tests.
+"""
+from functools import lru_cache
+import math
+
+import numpy as np
+
+
+@lru_cache(maxsize=None)
+def _njit():
+    """Return ``numba.njit`` or ``None`` when Numba is not installed."""
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    return njit
+
+
+def _project_dome(az_deg, alt_deg, mag, size_scale, size_min, size_max, out_x, out_y, out_size):
+    """Dome projection plus magnitude->size in a single pass.
+
+    Writes x = r*sin(az), y = r*cos(az) with r = clip((90-alt)/90, 0, 1) and
+    size = clip((6-mag)*size_scale, size_min, size_max) into the `out_*`
+    arrays, which must be at least as long as the inputs.
+    """
+    deg = math.pi / 180.0
+    for i in range(az_deg.shape[0]):
+        r = (90.0 - alt_deg[i]) / 90.0
+        if r < 0.0:
+            r = 0.0
+        elif r > 1.0:
+            r = 1.0
+        a = az_deg[i] * deg
+        out_x[i] = r * math.sin(a)
+        out_y[i] = r * math.cos(a)
+        size = (6.0 - mag[i]) * size_scale
+        if size < size_min:
+            size = size_min
+        elif size > size_max:
+            size = size_max
+        out_size[i] = size
+
+
+@lru_cache(maxsize=None)
+def dome_projection_kernel():
+    """Compiled :func:`_project_dome`, or ``None`` without Numba."""
+    njit = _njit()
+    if njit is None:
+        return None
+    return njit(fastmath=True, cache=True, boundscheck=False)(_project_dome)
+
+
+def _place_greedy(px, py, w_text, h_text, priority, width, height, out_x, out_y, out_placed):
+    """Greedy label placement over candidates already sorted by priority.
+
+    Each label is a ``w_text[i] x h_text`` box anchored at (px+6, py-6); the
+    first of nine offsets that stays inside ``width x height`` without
+    overlapping an earlier label wins. Labels with priority <= 1 that fit
+    nowhere are forced at the base offset. Writes the top-left corner into
+    `out_x`/`out_y`, 1/0 into `out_placed`, and returns the number placed.
+
+    Placed boxes are kept in a uniform grid of ``h_text``-sized cells (a
+    linked list per cell) so each test only visits nearby boxes.
+    """
+    n = px.shape[0]
+    cell = max(1, h_text)
+    ncx = width // cell + 1
+    ncy = height // cell + 1
+    head = np.full(ncx * ncy, -1, dtype=np.int64)
+    # capacity: every box spans at most (w // cell + 2) x (h // cell + 2) cells
+    cap = 0
+    for i in range(n):
+        cap += (w_text[i] // cell + 2) * (h_text // cell + 2)
+    entry_box = np.empty(cap, dtype=np.int64)
+    entry_next = np.empty(cap, dtype=np.int64)
+    n_entries = 0
+    box_l = np.empty(n, dtype=np.int64)
+    box_t = np.empty(n, dtype=np.int64)
+    box_r = np.empty(n, dtype=np.int64)
+    box_b = np.empty(n, dtype=np.int64)
+    n_boxes = 0
+    offsets = ((0, 0), (12, 0), (-12, 0), (0, 12), (0, -12), (12, 12), (-12, 12), (12, -12), (-12, -12))
+    n_placed = 0
+    for i in range(n):
+        out_placed[i] = 0
+        base_l = px[i] + 6
+        base_t = py[i] - 6
+        found = False
+        left = base_l
+        top = base_t
+        for k in range(9):
+            left = base_l + offsets[k][0]
+            top = base_t + offsets[k][1]
+            right = left + w_text[i]
+            bottom = top + h_text
+            if left < 0 or top < 0 or right > width or bottom > height:
+                continue
+            hit = False
+            for gx in range(left // cell, right // cell + 1):
+                for gy in range(top // cell, bottom // cell + 1):
+                    e = head[gx * ncy + gy]
+                    while e >= 0:
+                        b = entry_box[e]
+                        if not (right <= box_l[b] or left >= box_r[b] or bottom <= box_t[b] or top >= box_b[b]):
+                            hit = True
+                            break
+                        e = entry_next[e]
+                    if hit:
+                        break
+                if hit:
+                    break
+            if not hit:
+                found = True
+                break
+        if not found:
+            if priority[i] > 1:
+                continue
+            left = base_l
+            top = base_t
+        right = left + w_text[i]
+        bottom = top + h_text
+        box_l[n_boxes] = left
+        box_t[n_boxes] = top
+        box_r[n_boxes] = right
+        box_b[n_boxes] = bottom
+        # forced boxes may leave the view; clamp their cells to the grid
+        gx0 = min(max(left // cell, 0), ncx - 1)
+        gx1 = min(max(right // cell, 0), ncx - 1)
+        gy0 = min(max(top // cell, 0), ncy - 1)
+        gy1 = min(max(bottom // cell, 0), ncy - 1)
+        for gx in range(gx0, gx1 + 1):
+            for gy in range(gy0, gy1 + 1):
+                c = gx * ncy + gy
+                entry_box[n_entries] = n_boxes
+                entry_next[n_entries] = head[c]
+                head[c] = n_entries
+                n_entries += 1
+        n_boxes += 1
+        out_x[i] = left
+        out_y[i] = top
+        out_placed[i] = 1
+        n_placed += 1
+    return n_placed
+
+
+@lru_cache(maxsize=None)
+def greedy_placement_kernel():
+    """Compiled :func:`_place_greedy`, or ``None`` without Numba."""
+    njit = _njit()
+    if njit is None:
+        return None
+    return njit(cache=True)(_place_greedy)
+
+
+def _assemble_segments(pos, rows, out_pos):
+    """Gather line-segment endpoints for ``GL_LINES`` in one pass.
+
+    `rows` is an (M, 2) array of row indices into `pos` (N, 3), with -1 for
+    a star that is not visible. Segments with both rows valid are written
+    to `out_pos` (at least (2M, 3)) as consecutive endpoint pairs, in
+    order; returns the number of endpoints written.
+    """
+    n = 0
+    for k in range(rows.shape[0]):
+        a = rows[k, 0]
+        b = rows[k, 1]
+        if a < 0 or b < 0:
+            continue
+        for j in range(3):
+            out_pos[n, j] = pos[a, j]
+            out_pos[n + 1, j] = pos[b, j]
+        n += 2
+    return n
+
+
+@lru_cache(maxsize=None)
+def segment_assembly_kernel():
+    """Compiled :func:`_assemble_segments`, or ``None`` without Numba."""
+    njit = _njit()
+    if njit is None:
+        return None
+    return njit(cache=True, boundscheck=False)(_assemble_segments)
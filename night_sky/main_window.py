@@ -1,6 +1,7 @@
 from PyQt5 import QtWidgets, QtCore
 from PyQt5.QtWidgets import QLabel, QLineEdit, QPushButton, QHBoxLayout, QVBoxLayout, QWidget, QDateTimeEdit, QFileDialog, QTabWidget, QInputDialog, QDockWidget, QRadioButton, QDoubleSpinBox, QComboBox, QTextEdit, QSlider, QListWidget, QDialog
 from datetime import datetime, timezone
+from types import MappingProxyType
 
 from .sky_model import SkyModel
 from .sky_view_2d import SkyView2D
@@ -8,9 +9,9 @@ from .earth_view_2d import EarthView2D
 from .export import export_view_to_png
 from .settings import DEFAULTS
 from .location_selector import LocationSelector
-from .constellations import load_constellation_lines, build_constellation_segments
+from .constellations import load_constellation_lines, build_constellation_segments, constellation_edge_ids
 from .opengl_utils import explain_failure, opengl_available
-from .prefs import load_prefs, save_prefs
+from .prefs import load_prefs, save_prefs, save_prefs_debounced
 from .theme import apply_theme, THEMES
 from .moon_phase_widget import MoonPhaseWidget
 from .help_viewer import HelpViewer
@@ -38,6 +39,16 @@ except Exception:
 
 
 class MainWindow(QtWidgets.QMainWindow):
+    # FOV preset label -> overlay radius in degrees (half the field width)
+    _FOV_PRESETS = MappingProxyType({
+        "None": 0.0,
+        "Wide 60°": 30.0,
+        "Binocular 7°": 3.5,
+        "Telescope 1°": 0.5,
+        "Planetary 0.3°": 0.15,
+        "DSLR 5°": 2.5,
+    })
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle('Night Sky Viewer (v0.3)')
@@ -76,6 +87,8 @@ class MainWindow(QtWidgets.QMainWindow):
             self.constellation_lines = load_constellation_lines()
         except FileNotFoundError:
             pass  # No constellation file yet
+        # (M, 2) star-id table for the 3D view, which skips hidden stars itself
+        self.constellation_edges = constellation_edge_ids(self.constellation_lines)
         
         self.current_lat = float(self.prefs.get('lat_deg', 0.0))
         self.current_lon = float(self.prefs.get('lon_deg', 0.0))
@@ -161,9 +174,15 @@ class MainWindow(QtWidgets.QMainWindow):
         self.time_slider = QSlider(QtCore.Qt.Horizontal)
         self.time_slider.setRange(-720, 720)  # +/-12h in minutes
         self.time_slider.setValue(0)
+        # base time captured on slider press so a drag does not re-read the clock
+        self._slider_base = None
         self.time_step_minutes = 10
         self.play_timer = QtCore.QTimer(self)
         self.play_timer.timeout.connect(self._on_time_tick)
+        # coalesces bursts of time changes (slider drags, playback) into one redraw per frame
+        self._sky_update_timer = QtCore.QTimer(self)
+        self._sky_update_timer.setSingleShot(True)
+        self._sky_update_timer.timeout.connect(self.update_sky)
         self.playing = False
         self.time_step_spin = QtWidgets.QSpinBox()
         self.time_step_spin.setRange(1, 180)
@@ -431,6 +450,8 @@ class MainWindow(QtWidgets.QMainWindow):
         self.step_minus.clicked.connect(lambda: self._step_time(-self.time_step_minutes))
         self.step_plus.clicked.connect(lambda: self._step_time(self.time_step_minutes))
         self.time_slider.valueChanged.connect(self._on_time_slider)
+        self.time_slider.sliderPressed.connect(self._on_time_slider_pressed)
+        self.time_slider.sliderReleased.connect(self._on_time_slider_released)
         self.time_step_spin.valueChanged.connect(self._on_time_step_changed)
         self.grid_ra_dec.toggled.connect(self._on_overlay_changed)
         self.grid_alt_az.toggled.connect(self._on_overlay_changed)
@@ -533,7 +554,7 @@ class MainWindow(QtWidgets.QMainWindow):
             pass
         try:
             self.prefs['show_dso'] = flag
-            save_prefs(self.prefs)
+            save_prefs_debounced(self.prefs)
         except Exception:
             pass
         self.update_sky()
@@ -542,11 +563,11 @@ class MainWindow(QtWidgets.QMainWindow):
         """Toggle drawing of constellation lines in the active view(s)."""
         try:
             if checked and self.constellation_lines and self.current_stars:
-                star_map = {s.id: s for s in self.current_stars}
-                segments = build_constellation_segments(star_map, self.constellation_lines)
                 if self.current_view == '3d' and self.sky_view_3d:
-                    self.sky_view_3d.update_constellations(segments)
+                    self.sky_view_3d.update_constellations(self.constellation_edges)
                 else:
+                    star_map = {s.id: s for s in self.current_stars}
+                    segments = build_constellation_segments(star_map, self.constellation_lines)
                     self.sky_view.update_constellations(segments)
             else:
                 # Clear constellation lines
@@ -759,7 +780,7 @@ class MainWindow(QtWidgets.QMainWindow):
         try:
             self.prefs['lat_deg'] = float(lat)
             self.prefs['lon_deg'] = float(lon)
-            save_prefs(self.prefs)
+            save_prefs_debounced(self.prefs)
         except Exception:
             pass
         # Update Earth view markers
@@ -776,7 +797,7 @@ class MainWindow(QtWidgets.QMainWindow):
         try:
             self.prefs['lat_deg'] = float(lat)
             self.prefs['lon_deg'] = float(lon)
-            save_prefs(self.prefs)
+            save_prefs_debounced(self.prefs)
         except Exception:
             pass
         # Update location selector (will trigger _on_location_changed if needed)
@@ -799,7 +820,7 @@ class MainWindow(QtWidgets.QMainWindow):
             pass
         try:
             self.prefs['projection_mode'] = mode
-            save_prefs(self.prefs)
+            save_prefs_debounced(self.prefs)
         except Exception:
             pass
         try:
@@ -858,15 +879,13 @@ class MainWindow(QtWidgets.QMainWindow):
         
         # Pass the stars and planets to the active view
         if self.current_view == '3d' and self.sky_view_3d:
-            self.sky_view_3d.update_sky(snapshot.visible_stars, snapshot.visible_planets, snapshot.deep_sky_objects)
+            self.sky_view_3d.update_sky(snapshot.visible_stars, snapshot.visible_planets, snapshot.deep_sky_objects, star_arrays=snapshot.star_arrays)
             # Compute and draw constellation segments if available
             if self.constellation_lines and snapshot.visible_stars:
-                star_map = {s.id: s for s in snapshot.visible_stars}
-                segments = build_constellation_segments(star_map, self.constellation_lines)
-                self.sky_view_3d.update_constellations(segments)
+                self.sky_view_3d.update_constellations(self.constellation_edges)
         else:
             # 2D view
-            self.sky_view.update_sky(snapshot.visible_stars, snapshot.visible_planets, snapshot.deep_sky_objects)
+            self.sky_view.update_sky(snapshot.visible_stars, snapshot.visible_planets, snapshot.deep_sky_objects, star_arrays=snapshot.star_arrays)
             # Compute and draw constellation segments if available
             if self.constellation_lines and snapshot.visible_stars:
                 star_map = {s.id: s for s in snapshot.visible_stars}
@@ -941,7 +960,7 @@ class MainWindow(QtWidgets.QMainWindow):
             self.update_sky()
         try:
             self.prefs['view_mode'] = mode
-            save_prefs(self.prefs)
+            save_prefs_debounced(self.prefs)
         except Exception:
             pass
     
@@ -989,14 +1008,14 @@ class MainWindow(QtWidgets.QMainWindow):
         try:
             self.sky_model.set_limiting_magnitude(float(value))
             self.prefs['limiting_magnitude'] = float(value)
-            save_prefs(self.prefs)
+            save_prefs_debounced(self.prefs)
         except Exception:
             pass
         self.update_sky()
 
     def _on_label_density_changed(self, idx: int):
         self.prefs['label_density'] = int(idx)
-        save_prefs(self.prefs)
+        save_prefs_debounced(self.prefs)
         self.update_sky()
 
     def _on_theme_changed(self, idx: int):
@@ -1004,7 +1023,7 @@ class MainWindow(QtWidgets.QMainWindow):
         if not key:
             key = list(THEMES.keys())[idx]
         self.prefs['theme'] = key
-        save_prefs(self.prefs)
+        save_prefs_debounced(self.prefs)
         apply_theme(QtWidgets.QApplication.instance(), key)
         # reapply background colors to views
         try:
@@ -1023,13 +1042,13 @@ class MainWindow(QtWidgets.QMainWindow):
             self.milky_path_edit.setText(path)
             self.sky_view.set_milky_way_texture(path)
             self.prefs['milky_way_texture'] = path
-            save_prefs(self.prefs)
+            save_prefs_debounced(self.prefs)
 
     def _on_clear_milky(self):
         self.milky_path_edit.setText('')
         self.sky_view.set_milky_way_texture('')
         self.prefs['milky_way_texture'] = ''
-        save_prefs(self.prefs)
+        save_prefs_debounced(self.prefs)
 
     def _on_browse_panorama(self):
         path, _ = QFileDialog.getOpenFileName(self, 'Select panorama/landscape', '', 'Images (*.png *.jpg *.jpeg *.webp)')
@@ -1037,37 +1056,37 @@ class MainWindow(QtWidgets.QMainWindow):
             self.panorama_path_edit.setText(path)
             self.sky_view.set_panorama_image(path)
             self.prefs['panorama_image'] = path
-            save_prefs(self.prefs)
+            save_prefs_debounced(self.prefs)
 
     def _on_clear_panorama(self):
         self.panorama_path_edit.setText('')
         self.sky_view.set_panorama_image('')
         self.prefs['panorama_image'] = ''
-        save_prefs(self.prefs)
+        save_prefs_debounced(self.prefs)
 
     def _on_time_scale_changed(self, idx: int):
         scale = 'utc' if idx == 0 else 'tt'
         self.prefs['time_scale'] = scale
-        save_prefs(self.prefs)
+        save_prefs_debounced(self.prefs)
         self.sky_model.time_scale = scale
         self.update_sky()
 
     def _on_refraction_toggled(self, checked: bool):
         self.prefs['apply_refraction'] = bool(checked)
-        save_prefs(self.prefs)
+        save_prefs_debounced(self.prefs)
         self.sky_model.apply_refraction = bool(checked)
         self.update_sky()
 
     def _on_light_pollution_changed(self, value: int):
         self.prefs['light_pollution_bortle'] = int(value)
-        save_prefs(self.prefs)
+        save_prefs_debounced(self.prefs)
         self.sky_model.light_pollution_bortle = int(value)
         self.update_sky()
 
     def _on_catalog_mode_changed(self, idx: int):
         mode = ['default', 'rich', 'custom'][idx] if idx < 3 else 'default'
         self.prefs['catalog_mode'] = mode
-        save_prefs(self.prefs)
+        save_prefs_debounced(self.prefs)
         self.sky_model.catalog_mode = mode
         self.sky_model.custom_catalog = self.custom_catalog_edit.text().strip()
         self.sky_model.load_stars()
@@ -1082,7 +1101,7 @@ class MainWindow(QtWidgets.QMainWindow):
     def _on_custom_catalog_changed(self):
         path = self.custom_catalog_edit.text().strip()
         self.prefs['custom_catalog_path'] = path
-        save_prefs(self.prefs)
+        save_prefs_debounced(self.prefs)
         if self.catalog_combo.currentIndex() == 2:
             self.sky_model.custom_catalog = path
             self.sky_model.load_stars()
@@ -1090,7 +1109,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def _on_high_acc_ephem_toggled(self, checked: bool):
         self.prefs['high_accuracy_ephem'] = bool(checked)
-        save_prefs(self.prefs)
+        save_prefs_debounced(self.prefs)
         self.sky_model.high_accuracy_ephem = bool(checked)
         if checked:
             reply = QtWidgets.QMessageBox.question(
@@ -1106,13 +1125,13 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def _on_precession_toggled(self, checked: bool):
         self.prefs['precession_nutation'] = bool(checked)
-        save_prefs(self.prefs)
+        save_prefs_debounced(self.prefs)
         # hook for future precession/nutation toggles
         self.sky_model.precession_nutation = bool(checked)
 
     def _on_aberration_toggled(self, checked: bool):
         self.prefs['apply_aberration'] = bool(checked)
-        save_prefs(self.prefs)
+        save_prefs_debounced(self.prefs)
         self.sky_model.apply_aberration = bool(checked)
 
     def _on_export_settings(self):
@@ -1306,11 +1325,17 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def _on_time_slider(self, val: int):
         """Slider is minutes offset from current base time."""
-        base = datetime.utcnow().replace(tzinfo=timezone.utc)
+        base = self._slider_base or datetime.now(timezone.utc)
         dt = base + timedelta(minutes=val)
         qt_dt = QtCore.QDateTime(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second, QtCore.Qt.UTC)
         self.datetime_edit.setDateTime(qt_dt)
-        self.update_sky()
+        self._request_update_sky()
+
+    def _on_time_slider_pressed(self):
+        self._slider_base = datetime.now(timezone.utc)
+
+    def _on_time_slider_released(self):
+        self._slider_base = None
 
     def _on_time_tick(self):
         self._step_time(self.time_step_minutes)
@@ -1322,7 +1347,16 @@ class MainWindow(QtWidgets.QMainWindow):
         qdt = self.datetime_edit.dateTime().toUTC()
         dt = qdt.addSecs(minutes * 60)
         self.datetime_edit.setDateTime(dt)
-        self.update_sky()
+        self._request_update_sky()
+
+    def _request_update_sky(self):
+        """Schedule `update_sky` on the next frame (~16 ms), merging repeated requests.
+
+        The timer is not restarted while pending so a continuous drag still
+        redraws every frame; `update_sky` reads the latest time when it fires.
+        """
+        if not self._sky_update_timer.isActive():
+            self._sky_update_timer.start(16)
 
     def _toggle_play(self):
         self.playing = not self.playing
@@ -1360,14 +1394,4 @@ class MainWindow(QtWidgets.QMainWindow):
             pass
 
     def _on_fov_preset(self):
-        preset = self.fov_presets.currentText()
-        mapping = {
-            "None": 0.0,
-            "Wide 60°": 30.0,
-            "Binocular 7°": 3.5,
-            "Telescope 1°": 0.5,
-            "Planetary 0.3°": 0.15,
-            "DSLR 5°": 2.5,
-        }
-        val = mapping.get(preset, 0.0)
-        self.fov_spin.setValue(val)
+        self.fov_spin.setValue(self._FOV_PRESETS.get(self.fov_presets.currentText(), 0.0))
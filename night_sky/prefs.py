@@ -1,10 +1,28 @@
 """Simple preferences persistence for Night Sky Viewer v0.3.
 
 Stores a small JSON file under the user's home directory `~/.night_sky/prefs.json`.
-Provides `load_prefs()` and `save_prefs()` helpers.
+Provides `load_prefs()` and `save_prefs()` helpers, plus
+`save_prefs_debounced()` for Qt handlers that fire in rapid bursts.
 """
+import os
 from pathlib import Path
-import json
+
+try:
+    import orjson
+
+    def _loads(data: bytes):
+        return orjson.loads(data)
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:  # orjson is optional; fall back to the stdlib
+    import json
+
+    def _loads(data: bytes):
+        return json.loads(data)
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode('utf-8')
 
 CONFIG_DIR = Path.home() / '.night_sky'
 CONFIG_PATH = CONFIG_DIR / 'prefs.json'
@@ -37,48 +55,92 @@ DEFAULT_PREFS = {
     'panorama_image': '',
 }
 
+# per-key cast applied when saving, so stored values keep the default's type
+_CAST = {k: type(v) for k, v in DEFAULT_PREFS.items()}
+
+_dir_ready = False
+# state for save_prefs_debounced(): latest prefs awaiting write and its timer
+_pending = None
+_timer = None
+
+
+def _ensure_dir():
+    """Create CONFIG_DIR once per process instead of on every load/save."""
+    global _dir_ready
+    if not _dir_ready:
+        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        _dir_ready = True
+
 
 def load_prefs():
+    # make sure a debounced write is on disk before reading it back
+    flush_pending_prefs()
     try:
-        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-        if CONFIG_PATH.exists():
-            with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            # merge defaults
-            prefs = DEFAULT_PREFS.copy()
-            prefs.update({k: data.get(k, prefs[k]) for k in prefs.keys()})
-            return prefs
+        _ensure_dir()
+        try:
+            data = _loads(CONFIG_PATH.read_bytes())
+        except FileNotFoundError:
+            return DEFAULT_PREFS.copy()
+        # merge defaults, keeping only known keys from the file
+        return {**DEFAULT_PREFS, **{k: v for k, v in data.items() if k in DEFAULT_PREFS}}
     except Exception:
         pass
     return DEFAULT_PREFS.copy()
 
 
 def save_prefs(prefs: dict):
+    # a direct save supersedes any pending debounced write
+    _cancel_pending()
     try:
-        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        _ensure_dir()
         # Only write known keys, preserving types
-        out = {}
-        for key, default_val in DEFAULT_PREFS.items():
-            val = prefs.get(key, default_val)
-            if isinstance(default_val, bool):
-                val = bool(val)
-            elif isinstance(default_val, float):
-                val = float(val)
-            elif isinstance(default_val, int):
-                val = int(val)
-            out[key] = val
-        with open(CONFIG_PATH, 'w', encoding='utf-8') as f:
-            json.dump(out, f, indent=2)
+        out = {k: _CAST[k](prefs.get(k, v)) for k, v in DEFAULT_PREFS.items()}
+        # write to a sibling file and swap it in so a crash never truncates prefs
+        tmp = CONFIG_PATH.with_suffix('.json.tmp')
+        tmp.write_bytes(_dumps(out))
+        os.replace(tmp, CONFIG_PATH)
     except Exception:
         pass
 
 
+def save_prefs_debounced(prefs: dict, delay_ms: int = 300):
+    """Schedule `save_prefs(prefs)` after `delay_ms` without further calls.
+
+    Bursts of calls (slider drags, spin boxes) collapse into a single write.
+    Needs a running Qt event loop; `load_prefs()` flushes any pending write.
+    """
+    global _pending, _timer
+    from PyQt5 import QtCore
+
+    _pending = prefs
+    if _timer is None:
+        _timer = QtCore.QTimer()
+        _timer.setSingleShot(True)
+        _timer.timeout.connect(flush_pending_prefs)
+    _timer.start(delay_ms)
+
+
+def flush_pending_prefs():
+    """Write a pending debounced save immediately, if there is one."""
+    global _pending
+    if _pending is None:
+        return
+    prefs, _pending = _pending, None
+    save_prefs(prefs)
+
+
+def _cancel_pending():
+    global _pending
+    if _pending is not None and _timer is not None:
+        _timer.stop()
+    _pending = None
+
+
 def export_prefs(path: str):
     """Export current prefs to a JSON file."""
     try:
         prefs = load_prefs()
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(prefs, f, indent=2)
+        Path(path).write_bytes(_dumps(prefs))
         return True
     except Exception:
         return False
@@ -87,8 +149,7 @@ def export_prefs(path: str):
 def import_prefs(path: str):
     """Import prefs from a JSON file, merging with defaults."""
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = _loads(Path(path).read_bytes())
         prefs = DEFAULT_PREFS.copy()
         prefs.update(data)
         save_prefs(prefs)
@@ -20,6 +20,7 @@ The dataclasses ``Star``, ``Planet``, and ``SkySnapshot`` are lightweight
 value objects intended for consumption by GUI code, exports, and tests.
 """
 
+import logging
 from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
@@ -34,6 +35,8 @@ from astropy.utils.data import download_file
 
 from .data_manager import load_bright_stars
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class Star:
@@ -58,6 +61,55 @@ class Star:
     az_deg: float
 
 
+@dataclass
+class StarArrays:
+    """Column (SoA) view of a list of :class:`Star`, as parallel arrays.
+
+    Row ``i`` describes the ``i``-th star of the list it was built from.
+    Angles and magnitudes are float32. ``az_mod360`` and ``zen_norm``
+    (``clip((90 - alt) / 90, 0, 1)``) are the inputs of the 2D rect and dome
+    projections, precomputed once per snapshot so views do not redo them on
+    every redraw.
+    """
+
+    ids: np.ndarray
+    alt_deg: np.ndarray
+    az_deg: np.ndarray
+    mag: np.ndarray
+    az_mod360: np.ndarray
+    zen_norm: np.ndarray
+
+    @classmethod
+    def from_columns(cls, ids, alt_deg, az_deg, mag) -> "StarArrays":
+        alt = np.asarray(alt_deg, dtype=np.float32)
+        az = np.asarray(az_deg, dtype=np.float32)
+        return cls(
+            ids=np.asarray(ids, dtype=np.int64),
+            alt_deg=alt,
+            az_deg=az,
+            mag=np.asarray(mag, dtype=np.float32),
+            az_mod360=np.mod(az, np.float32(360.0)),
+            zen_norm=np.clip((np.float32(90.0) - alt) / np.float32(90.0), 0.0, 1.0),
+        )
+
+    @classmethod
+    def from_stars(cls, stars: List[Star]) -> "StarArrays":
+        n = len(stars)
+        return cls.from_columns(
+            np.fromiter((s.id for s in stars), dtype=np.int64, count=n),
+            np.fromiter((s.alt_deg for s in stars), dtype=np.float32, count=n),
+            np.fromiter((s.az_deg for s in stars), dtype=np.float32, count=n),
+            np.fromiter((s.mag for s in stars), dtype=np.float32, count=n),
+        )
+
+    def take(self, idx) -> "StarArrays":
+        """Rows selected by an index array or boolean mask."""
+        return StarArrays(self.ids[idx], self.alt_deg[idx], self.az_deg[idx], self.mag[idx], self.az_mod360[idx], self.zen_norm[idx])
+
+    def __len__(self) -> int:
+        return self.alt_deg.shape[0]
+
+
 @dataclass
 class Planet:
     """Represents a solar-system body (planet or Moon) at a specific observation time."""
@@ -83,6 +135,7 @@ class SkySnapshot:
     - visible_stars: List of :class:`Star` objects with ``alt_deg > 0``.
     - visible_planets: List of :class:`Planet` objects with ``alt_deg > 0`` (includes Moon).
     - moon: Optional :class:`Planet` entry representing the Moon with phase metadata.
+    - star_arrays: Optional :class:`StarArrays` parallel to ``visible_stars``.
     """
 
     visible_stars: List[Star]
@@ -90,6 +143,7 @@ class SkySnapshot:
     moon: Optional[Planet] = None
     deep_sky_objects: Optional[List["DeepSkyObject"]] = None
     events: Optional[List[dict]] = None
+    star_arrays: Optional[StarArrays] = None
 
 
 @dataclass
@@ -132,6 +186,13 @@ class SkyModel:
         self.precession_nutation = bool(precession_nutation)
         self.apply_aberration = bool(apply_aberration)
         self._ephem_kernel_path = None
+        # float32 catalog columns keyed by limiting magnitude (see _catalog_arrays)
+        self._catalog_cache_key = None
+        self._catalog_cache = []
+        self._ra32 = np.empty(0, dtype=np.float32)
+        self._dec32 = np.empty(0, dtype=np.float32)
+        self._ids64 = np.empty(0, dtype=np.int64)
+        self._mag32 = np.empty(0, dtype=np.float32)
         self.load_stars()
 
     def load_stars(self) -> None:
@@ -146,6 +207,27 @@ class SkyModel:
         elif self.catalog_mode == 'custom' and self.custom_catalog:
             catalog = self.custom_catalog
         self.stars = load_bright_stars(catalog)
+        self._catalog_cache_key = None
+
+    def _catalog_arrays(self, mag_limit: float):
+        """Return the filtered catalog and its float32 RA/Dec columns.
+
+        The columns are rebuilt only when the limiting magnitude or the loaded
+        catalog changes, so repeated snapshots reuse the same contiguous
+        arrays instead of re-walking the list of dicts. The matching id and
+        magnitude columns are kept alongside in ``_ids64`` / ``_mag32``.
+        """
+        key = (id(self.stars), len(self.stars), mag_limit)
+        if self._catalog_cache_key != key:
+            stars_catalog = self._filter_catalog_by_mag(self.stars, mag_limit)
+            n = len(stars_catalog)
+            self._ra32 = np.fromiter((s['ra_deg'] for s in stars_catalog), dtype=np.float32, count=n)
+            self._dec32 = np.fromiter((s['dec_deg'] for s in stars_catalog), dtype=np.float32, count=n)
+            self._ids64 = np.fromiter((int(s['id']) for s in stars_catalog), dtype=np.int64, count=n)
+            self._mag32 = np.fromiter((float(s['mag']) for s in stars_catalog), dtype=np.float32, count=n)
+            self._catalog_cache = stars_catalog
+            self._catalog_cache_key = key
+        return self._catalog_cache, self._ra32, self._dec32
 
     @staticmethod
     def _filter_catalog_by_mag(catalog: List[dict], mag_limit: float) -> List[dict]:
@@ -277,8 +359,8 @@ class SkyModel:
         altaz_frame = AltAz(obstime=times, location=location)
 
         try:
-            ra = np.array([float(r['ra_deg']) for r in dso_rows])
-            dec = np.array([float(r['dec_deg']) for r in dso_rows])
+            ra = np.fromiter((float(r['ra_deg']) for r in dso_rows), dtype=np.float64, count=len(dso_rows))
+            dec = np.fromiter((float(r['dec_deg']) for r in dso_rows), dtype=np.float64, count=len(dso_rows))
         except Exception:
             return []
 
@@ -394,15 +476,18 @@ class SkyModel:
         times = Time(dt_utc)
         location = EarthLocation(lat=lat_deg * u.deg, lon=lon_deg * u.deg, height=0 * u.m)
         altaz_frame = AltAz(obstime=times, location=location)
-        sun_coord_cache = None
-
         visible_planets = []
-        for planet_name in self.PLANETS:
-            try:
-                with self._ephem_context():
+        # Enter the ephemeris context once; a failure on one body is logged
+        # and skipped so the remaining planets are still returned.
+        with self._ephem_context():
+            for planet_name in self.PLANETS:
+                try:
                     planet_coord = get_body(planet_name, times, location)
-                aa = planet_coord.transform_to(altaz_frame)
-                
+                    aa = planet_coord.transform_to(altaz_frame)
+                except Exception:
+                    logger.warning("Position computation failed for %s", planet_name, exc_info=True)
+                    continue
+
                 # Only include if above horizon
                 alt_corr = self._apply_refraction(float(aa.alt.degree))
                 if alt_corr > 0.0:
@@ -414,10 +499,7 @@ class SkyModel:
                         az_deg=float(aa.az.degree),
                         magnitude=None  # Could be computed but not needed for visualization
                     ))
-            except Exception:
-                # Skip planets that fail to compute (e.g., Sun, Moon may have special handling)
-                pass
-        
+
         return visible_planets
 
     def compute_snapshot(self, lat_deg: float, lon_deg: float, dt_utc: datetime) -> SkySnapshot:
@@ -454,31 +536,33 @@ class SkyModel:
         # adjust limiting magnitude by light pollution (simple model: degrade by 0.2 mag per Bortle step above 1)
         lp_penalty = max(0, self.light_pollution_bortle - 1) * 0.2
         effective_lim_mag = max(-5.0, self.limiting_magnitude - lp_penalty)
-        stars_catalog = self._filter_catalog_by_mag(self.stars, effective_lim_mag)
-        ra = np.array([s['ra_deg'] for s in stars_catalog])
-        dec = np.array([s['dec_deg'] for s in stars_catalog])
-        mag = np.array([s['mag'] for s in stars_catalog])
-        names = [s['name'] for s in stars_catalog]
-        ids = [s['id'] for s in stars_catalog]
+        stars_catalog, ra, dec = self._catalog_arrays(effective_lim_mag)
 
         # allow precession/nutation toggles (astropy handles by default; here we keep hook)
         starcoords = SkyCoord(ra=ra * u.deg, dec=dec * u.deg, frame='icrs')
         aa = starcoords.transform_to(altaz_frame)
-        alt = aa.alt.degree
-        az = aa.az.degree
-
+        alt = aa.alt.degree.astype(np.float32)
+        az = aa.az.degree.astype(np.float32)
+
+        # Only the stars above the horizon are packed into dataclasses; catalog
+        # values are taken from the source rows so RA/Dec/mag keep full precision.
+        keep = np.flatnonzero(alt > 0.0)
+        alt_refr = np.fromiter((self._apply_refraction(float(a)) for a in alt[keep]),
+                               dtype=np.float64, count=keep.shape[0])
         visible_stars = []
-        for i in range(len(ra)):
-            if alt[i] > 0.0:
-                visible_stars.append(Star(
-                    id=int(ids[i]),
-                    name=names[i],
-                    ra_deg=float(ra[i]),
-                    dec_deg=float(dec[i]),
-                    mag=float(mag[i]),
-                    alt_deg=float(self._apply_refraction(float(alt[i]))),
-                    az_deg=float(az[i]),
-                ))
+        for i, alt_i in zip(keep.tolist(), alt_refr.tolist()):
+            row = stars_catalog[i]
+            visible_stars.append(Star(
+                id=int(row['id']),
+                name=row['name'],
+                ra_deg=float(row['ra_deg']),
+                dec_deg=float(row['dec_deg']),
+                mag=float(row['mag']),
+                alt_deg=alt_i,
+                az_deg=float(az[i]),
+            ))
+        # the snapshot's columns come from the masked catalog arrays, not the Stars
+        star_arrays = StarArrays.from_columns(self._ids64[keep], alt_refr, az[keep], self._mag32[keep])
 
         # Get planets
         visible_planets = self.get_planet_positions(lat_deg, lon_deg, dt_utc)
@@ -517,6 +601,7 @@ class SkyModel:
             sun_aa = sun_coord_cache.transform_to(altaz_frame)
             if float(self.twilight_sun_alt) < 90.0 and sun_aa.alt.degree > float(self.twilight_sun_alt):
                 visible_stars = []
+                star_arrays = StarArrays.from_stars(visible_stars)
                 visible_planets = []
                 deep_sky = []
         except Exception:
@@ -539,4 +624,4 @@ class SkyModel:
         except Exception:
             pass
 
-        return SkySnapshot(visible_stars=visible_stars, visible_planets=visible_planets, moon=moon_obj, deep_sky_objects=deep_sky, events=events)
+        return SkySnapshot(visible_stars=visible_stars, visible_planets=visible_planets, moon=moon_obj, deep_sky_objects=deep_sky, events=events, star_arrays=star_arrays)
@@ -1,46 +1,110 @@
 from PyQt5 import QtWidgets, QtGui, QtCore
 import pyqtgraph as pg
 import numpy as np
-from PyQt5.QtGui import QPixmap, QFontMetrics, QLinearGradient, QColor
+from PyQt5.QtGui import QFontMetrics, QLinearGradient, QColor
 from PyQt5.QtCore import Qt
 
+from .kernels import dome_projection_kernel
+from .opengl_utils import opengl_available
+from .sky_model import StarArrays
+
+
+def _brightest_indices(mag: np.ndarray, threshold: float, k: int) -> np.ndarray:
+    """Indices of the `k` brightest entries with ``mag < threshold``, brightest first.
+
+    Uses a partition rather than a full sort; ties keep their original
+    order, matching a stable sort by magnitude.
+    """
+    idx = np.flatnonzero(mag < threshold)
+    if k <= 0:
+        return idx[:0]
+    if idx.size > k:
+        m = mag[idx]
+        kth = np.partition(m, k - 1)[k - 1]
+        strict = idx[m < kth]
+        ties = idx[m == kth][:k - strict.size]
+        idx = np.concatenate((strict, ties))
+    return idx[np.argsort(mag[idx], kind='stable')]
+
 
 class SkyView2D(QtWidgets.QWidget):
     """2D Alt/Az sky view using pyqtgraph.
 
     X axis: Azimuth [0,360]
     Y axis: Altitude [0,90]
+
+    With ``use_gl=True`` (and a working OpenGL stack) star and planet markers
+    are drawn by a ``GLScatterPlotItem`` on a ``GLViewWidget`` instead, which
+    keeps very large catalogues interactive. Labels, constellations and grids
+    still run through the PlotWidget path and are not shown in that mode yet.
+    The mode is opt-in only: MainWindow builds the default PlotWidget view.
     """
-    def __init__(self, parent=None):
+    # star count above which the scatter shows only the brightest star per pixel
+    _BIN_MIN_POINTS = 2000
+
+    def __init__(self, parent=None, use_gl: bool = False):
         super().__init__(parent)
+        self.use_gl = bool(use_gl) and opengl_available()
         self.plot = pg.PlotWidget()
-        self.plot.setBackground('#05070a')
-        self.plot.showGrid(x=True, y=True, alpha=0.3)
-        self.plot.setLabel('bottom', 'Azimuth', units='deg')
-        self.plot.setLabel('left', 'Altitude', units='deg')
-        self.plot.setXRange(0, 360)
-        self.plot.setYRange(0, 90)
 
         layout = QtWidgets.QVBoxLayout()
         layout.setContentsMargins(2, 2, 2, 2)
-        layout.addWidget(self.plot)
         self.setLayout(layout)
 
         self.star_scatter = pg.ScatterPlotItem()
         self.planet_scatter = pg.ScatterPlotItem()
         self.plot.addItem(self.star_scatter)
         self.plot.addItem(self.planet_scatter)
+        self.plot.getViewBox().sigRangeChanged.connect(self._on_view_range_changed)
+        # shared brushes/pens so redraws do not allocate one per spot
+        self._star_brush = pg.mkBrush(220, 230, 255)
+        self._planet_brush = pg.mkBrush(255, 255, 0)
+        self._planet_pen = pg.mkPen((255, 200, 0), width=1)
+        self._moon_brush = pg.mkBrush(200, 200, 255)
+        self._moon_pen = pg.mkPen((180, 180, 220), width=1)
         # projection mode: 'rect' (Az/Alt) or 'dome' (polar dome projection)
         self.mode = 'rect'
+        if self.use_gl:
+            self._init_gl_backend()
+            layout.addWidget(self.glview)
+        else:
+            layout.addWidget(self.plot)
         # stored constellation segments (list of (Star, Star))
         self.constellation_segments = []
-        self.constellation_items = []
+        # all constellation segments share one curve; NaN gaps split the segments
+        self.constellation_item = pg.PlotCurveItem(pen=pg.mkPen((180, 180, 255, 120), width=1), connect='finite')
+        self.plot.addItem(self.constellation_item)
+        # reusable output buffers for the compiled dome projection (rows: x, y, size)
+        self._proj_buf = np.empty((3, 0), dtype=np.float32)
         # mapping star id -> plotted (x,y) coordinates in current projection
         self._star_pos_by_id = {}
+        # star columns and view state of the last redraw; update_sky skips
+        # repeats. _view_version is bumped by setters whose state is not in
+        # the key.
+        self._last_star_input = None
+        self._last_star_arrays = None
+        self._last_state = None
+        self._view_version = 0
         # caching last data for redraws and label toggles
         self._last_stars = []
         self._last_planets = []
         self._last_dso = []
+        # visible subsets and projected star coordinates from the last update,
+        # reused by _refresh_labels so label toggles skip the projection pass
+        # indices into _last_stars of the stars drawn by the last update
+        self._visible_idx = np.empty(0, dtype=np.intp)
+        self._visible_planets = []
+        self._visible_dso = []
+        self._proj_x = np.empty(0, dtype=np.float32)
+        self._proj_y = np.empty(0, dtype=np.float32)
+        self._proj_mag = np.empty(0, dtype=np.float32)
+        self._proj_size = np.empty(0, dtype=np.float32)
+        self._planet_x = np.empty(0)
+        self._planet_y = np.empty(0)
+        # source of the cached projection (star columns, mode, limiting
+        # magnitude) and the last binning as (source, view key, indices)
+        self._proj_source = None
+        self._bin_cache = None
         # label flags
         self.show_star_labels = False
         self.show_planet_labels = False
@@ -49,6 +113,7 @@ class SkyView2D(QtWidgets.QWidget):
         self._placed_labels = []
         self.horizon_items = []
         self.ambient_items = []
+        self.overlay_items = []
         self._label_density_index = 1
         self.show_ra_dec_grid = False
         self.show_alt_az_grid = True
@@ -60,10 +125,16 @@ class SkyView2D(QtWidgets.QWidget):
         self.panorama_image_path: str = ''
         self._milky_way_item = None
         self._panorama_item = None
-        self._apply_background()
+        # mode the axes/background/ranges were last set up for; see _configure_axes
+        self._axis_configured_for = None
+        self._configure_axes()
         self._last_screen_map = {}  # id -> screen QPointF cache
-        # storage of label items (pyqtgraph TextItem)
+        # pooled label TextItems; the first len(_label_items) are shown, the
+        # rest are hidden and reused on the next label pass
+        self._label_pool = []
         self._label_items = []
+        # label font, fetched once; used for TextItems, metrics and export
+        self._label_font = QtWidgets.QApplication.font()
 
     def _mag_to_size(self, mag: float) -> float:
         # Brighter stars (smaller mag) should be larger.
@@ -71,6 +142,93 @@ class SkyView2D(QtWidgets.QWidget):
         size = (6.0 - mag) * 3.5
         return float(np.clip(size, 2.0, 30.0))
 
+    def _project_altaz(self, alt_deg: np.ndarray, az_deg: np.ndarray):
+        """Project Alt/Az arrays (deg) to plot (x, y) arrays for the current mode.
+
+        'rect' maps to (az % 360, alt); 'dome' uses r=(90-alt)/90 with the
+        zenith at the origin and North up.
+        """
+        if self.mode == 'rect':
+            return np.mod(az_deg, 360.0), np.asarray(alt_deg)
+        r = np.clip((90.0 - alt_deg) / 90.0, 0.0, 1.0)
+        az_rad = np.radians(az_deg)
+        return r * np.sin(az_rad), r * np.cos(az_rad)
+
+    def _init_gl_backend(self):
+        """Create the GLViewWidget and persistent scatter items for use_gl mode."""
+        from pyqtgraph.opengl import GLViewWidget, GLScatterPlotItem
+
+        self.glview = GLViewWidget()
+        self.glview.setBackgroundColor((5, 7, 10, 255))
+        empty = np.zeros((0, 3), dtype=np.float32)
+        self._gl_star_scatter = GLScatterPlotItem(pos=empty, pxMode=True)
+        self._gl_planet_scatter = GLScatterPlotItem(pos=empty, pxMode=True)
+        self.glview.addItem(self._gl_star_scatter)
+        self.glview.addItem(self._gl_planet_scatter)
+        self._gl_star_color = self._star_brush.color().getRgbF()
+        self._gl_planet_color = np.array(self._planet_brush.color().getRgbF(), dtype=np.float32)
+        self._gl_moon_color = np.array(self._moon_brush.color().getRgbF(), dtype=np.float32)
+        self._configure_gl_camera()
+
+    def _configure_gl_camera(self):
+        """Look straight down on the data plane so GL x/y match plot x/y."""
+        if self.mode == 'rect':
+            cx, cy, span = 180.0, 45.0, 360.0
+        else:
+            cx, cy, span = 0.0, 0.0, 2.1
+        # default 60 deg field of view: half-span / tan(30 deg)
+        distance = 0.5 * span / np.tan(np.radians(30.0))
+        self.glview.setCameraPosition(pos=pg.Vector(cx, cy, 0.0), distance=distance, elevation=90, azimuth=-90)
+
+    def _update_gl_scatter(self, x, y, sizes, px, py, p_sizes, is_moon):
+        """Upload star and planet markers to the GL backend as float32 arrays."""
+        pos = np.zeros((len(x), 3), dtype=np.float32)
+        pos[:, 0] = x
+        pos[:, 1] = y
+        self._gl_star_scatter.setData(pos=pos, size=np.asarray(sizes, dtype=np.float32), color=self._gl_star_color)
+        ppos = np.zeros((len(px), 3), dtype=np.float32)
+        ppos[:, 0] = px
+        ppos[:, 1] = py
+        pcolor = np.where(is_moon[:, None], self._gl_moon_color, self._gl_planet_color).astype(np.float32)
+        self._gl_planet_scatter.setData(pos=ppos, size=p_sizes.astype(np.float32), color=pcolor)
+
+    def _projection_buffers(self, n: int):
+        """Return (x, y, size) float32 views of length `n` over reusable buffers.
+
+        Buffers grow geometrically so steady-state redraws do not allocate.
+        """
+        if self._proj_buf.shape[1] < n:
+            self._proj_buf = np.empty((3, max(n, 2 * self._proj_buf.shape[1])), dtype=np.float32)
+        buf = self._proj_buf[:, :n]
+        return buf[0], buf[1], buf[2]
+
+    def _configure_axes(self):
+        """Set up background, axes and ranges for the current mode.
+
+        Runs only when the mode differs from the one last configured, so
+        per-frame redraws do not invalidate the axes or reset the view.
+        """
+        if self._axis_configured_for == self.mode:
+            return
+        self._apply_background()
+        if self.mode == 'rect':
+            self.plot.showAxis('bottom')
+            self.plot.showAxis('left')
+            self.plot.setAspectLocked(False)
+            self.plot.showGrid(x=True, y=True, alpha=0.3)
+            self.plot.setLabel('bottom', 'Azimuth', units='deg')
+            self.plot.setLabel('left', 'Altitude', units='deg')
+            self.plot.setXRange(0, 360)
+            self.plot.setYRange(0, 90)
+        else:
+            # For dome, use square aspect and hide numeric labels to look like a sky dome
+            self.plot.hideAxis('bottom')
+            self.plot.hideAxis('left')
+            self.plot.setAspectLocked(True)
+            self.plot.setXRange(-1.05, 1.05)
+            self.plot.setYRange(-1.05, 1.05)
+        self._axis_configured_for = self.mode
+
     def _apply_background(self):
         """Apply a subtle horizon gradient."""
         grad = QLinearGradient(0, 1, 0, 0)
@@ -106,98 +264,87 @@ class SkyView2D(QtWidgets.QWidget):
     def set_milky_way_texture(self, path: str):
         """Set optional Milky Way texture overlay."""
         self.milky_way_texture_path = path or ''
+        self._view_version += 1
         if self._last_stars:
             self.update_sky(self._last_stars, self._last_planets, self._last_dso)
 
     def set_panorama_image(self, path: str):
         """Set optional panorama/landscape near the horizon."""
         self.panorama_image_path = path or ''
+        self._view_version += 1
         if self._last_stars:
             self.update_sky(self._last_stars, self._last_planets, self._last_dso)
 
-    def update_sky(self, stars: list, planets: list = None, deep_sky: list = None):
+    def update_sky(self, stars: list, planets: list = None, deep_sky: list = None, star_arrays: StarArrays | None = None):
         """Redraw the plot from lists of `Star` and `Planet` objects.
 
         Each `Star` should have attributes: `az_deg`, `alt_deg`, and `mag`, etc.
         Each `Planet` should have attributes: `az_deg`, `alt_deg`, and `name`.
+        `star_arrays` (e.g. ``SkySnapshot.star_arrays``) are column arrays
+        parallel to `stars`; when omitted they are built from the list.
+
+        A call with the same star columns, equal planets and deep-sky
+        objects, and unchanged view settings is a no-op. Re-passing the
+        previous star list without `star_arrays` reuses the previous columns.
         """
         if planets is None:
             planets = []
         if deep_sky is None:
             deep_sky = []
+        stars = stars if stars is not None else []
+        if star_arrays is None and (stars is self._last_star_input or stars is self._last_stars):
+            star_arrays = self._last_star_arrays
+        if star_arrays is None or len(star_arrays) != len(stars):
+            star_arrays = StarArrays.from_stars(stars)
+        state = (self.mode, self.limiting_magnitude, self.show_dso, self._view_version, self.plot.width(), self.plot.height())
+        if (state == self._last_state and star_arrays is self._last_star_arrays
+                and planets == self._last_planets and deep_sky == self._last_dso):
+            return
+        if stars is not self._last_stars:
+            # remember the caller's list; setters re-pass our own copy
+            self._last_star_input = stars
+        self._last_star_arrays = star_arrays
+        self._last_state = state
 
         # cache last data for toggles
         self._last_stars = list(stars) if stars is not None else []
         self._last_planets = list(planets) if planets is not None else []
         self._last_dso = list(deep_sky) if deep_sky is not None else []
             
-        # Clear plot and reconfigure according to projection
-        self.plot.clear()
-        self.constellation_items = []
+        # Remove per-frame items; the star/planet scatters persist and are
+        # refreshed with setData so their symbol atlas is reused.
+        self.horizon_items = self._remove_items(self.horizon_items)
+        self.ambient_items = self._remove_items(self.ambient_items)
         self._star_pos_by_id = {}
-        self._placed_labels = []
-        # remove horizon items
-        for it in self.horizon_items:
-            try:
-                self.plot.removeItem(it)
-            except Exception:
-                pass
-        self.horizon_items = []
-        for it in self.ambient_items:
-            try:
-                self.plot.removeItem(it)
-            except Exception:
-                pass
-        self.ambient_items = []
         self._milky_way_item = None
         self._panorama_item = None
-        self._apply_background()
+        self._configure_axes()
 
         if not stars and not planets:
+            self.star_scatter.clear()
+            self.planet_scatter.clear()
+            self.constellation_item.clear()
+            self.overlay_items = self._remove_items(self.overlay_items)
+            self._visible_idx = np.empty(0, dtype=np.intp)
+            self._visible_planets, self._visible_dso = [], []
+            self._show_labels([])
+            self._placed_labels = []
             return
 
         # Filter visible stars (alt > 0) and mag <= limit
-        visible_stars = [s for s in stars if s.alt_deg > 0.0 and getattr(s, 'mag', 99.0) <= self.limiting_magnitude]
+        # Visibility is one mask over the star columns; Star objects are only
+        # looked up again (by index) for the few that get labels.
+        keep = np.flatnonzero((star_arrays.alt_deg > 0.0) & (star_arrays.mag <= np.float32(self.limiting_magnitude)))
+        visible_arrays = star_arrays.take(keep)
         visible_planets = [p for p in planets if p.alt_deg > 0.0]
         visible_dso = [d for d in deep_sky if getattr(d, 'alt_deg', -1) > 0.0] if self.show_dso else []
+        self._visible_idx = keep
+        self._visible_planets = visible_planets
+        self._visible_dso = visible_dso
         self._last_screen_map = {}
 
-        # Project star positions according to mode
-        star_spots = []
-        planet_spots = []
-        
-        if self.mode == 'rect':
-            # Rectangular Az/Alt: x=az(0..360), y=alt(0..90)
-            self._apply_background()
-            self.plot.showGrid(x=True, y=True, alpha=0.3)
-            self.plot.setLabel('bottom', 'Azimuth', units='deg')
-            self.plot.setLabel('left', 'Altitude', units='deg')
-            self.plot.setXRange(0, 360)
-            self.plot.setYRange(0, 90)
-            
-            for s in visible_stars:
-                x = float(s.az_deg % 360.0)
-                y = float(s.alt_deg)
-                star_spots.append({'pos': (x, y), 'size': self._mag_to_size(s.mag), 'brush': pg.mkBrush(220, 230, 255), 'pen': None})
-                self._star_pos_by_id[s.id] = (x, y)
-            
-            # Planets: larger, colored markers (yellow)
-            for p in visible_planets:
-                x = float(p.az_deg % 360.0)
-                y = float(p.alt_deg)
-                if getattr(p, 'name', '').lower() == 'moon':
-                    planet_spots.append({'pos': (x, y), 'size': 16, 'brush': pg.mkBrush(200, 200, 255), 'pen': pg.mkPen((180, 180, 220), width=1)})
-                else:
-                    planet_spots.append({'pos': (x, y), 'size': 12, 'brush': pg.mkBrush(255, 255, 0), 'pen': pg.mkPen((255, 200, 0), width=1)})
-        else:
+        if self.mode == 'dome':
             # Dome projection: center=zenith, radius=(90-alt)/90, angle=az
-            self._apply_background()
-            # For dome, use square aspect and hide numeric labels to look like a sky dome
-            self.plot.hideAxis('bottom')
-            self.plot.hideAxis('left')
-            self.plot.setAspectLocked(True)
-            self.plot.setXRange(-1.05, 1.05)
-            self.plot.setYRange(-1.05, 1.05)
             # horizon circle and compass
             thetas = np.linspace(0, 2 * np.pi, 256)
             xh = np.sin(thetas)
@@ -229,59 +376,126 @@ class SkyView2D(QtWidgets.QWidget):
                 if self._panorama_item:
                     self.plot.addItem(self._panorama_item)
                     self.ambient_items.append(self._panorama_item)
-            
-            for s in visible_stars:
-                az_rad = np.radians(s.az_deg)
-                r = float(np.clip((90.0 - s.alt_deg) / 90.0, 0.0, 1.0))
-                x = r * np.sin(az_rad)
-                y = r * np.cos(az_rad)
-                star_spots.append({'pos': (x, y), 'size': self._mag_to_size(s.mag), 'brush': pg.mkBrush(220, 230, 255), 'pen': None})
-                self._star_pos_by_id[s.id] = (x, y)
-            
-            # Planets in dome projection
-            for p in visible_planets:
-                az_rad = np.radians(p.az_deg)
-                r = float(np.clip((90.0 - p.alt_deg) / 90.0, 0.0, 1.0))
-                x = r * np.sin(az_rad)
-                y = r * np.cos(az_rad)
-                if getattr(p, 'name', '').lower() == 'moon':
-                    planet_spots.append({'pos': (x, y), 'size': 16, 'brush': pg.mkBrush(200, 200, 255), 'pen': pg.mkPen((180, 180, 220), width=1)})
+
+        self._proj_source = (star_arrays, self.mode, self.limiting_magnitude)
+        self._project_and_scatter(visible_arrays, visible_planets)
+        # If constellation segments are present, draw them
+        if self.constellation_segments:
+            self.update_constellations(self.constellation_segments)
+        self._refresh_labels()
+        # Grids and overlays
+        self._draw_overlays()
+
+    def _project_and_scatter(self, star_arrays: StarArrays, visible_planets: list):
+        """Project visible stars and planets and push markers to the scatters.
+
+        Stores the projected star coordinates in `_proj_x`/`_proj_y` (planets
+        in `_planet_x`/`_planet_y`) and the id -> (x, y) map used by
+        constellations, labels and picking.
+        """
+        # Stars: one vectorized projection pass over contiguous arrays
+        n_stars = len(star_arrays)
+        if n_stars:
+            alt, az, mag = star_arrays.alt_deg, star_arrays.az_deg, star_arrays.mag
+            kernel = dome_projection_kernel() if self.mode == 'dome' else None
+            if kernel is not None:
+                x, y, sizes = self._projection_buffers(n_stars)
+                kernel(az, alt, mag, 3.5, 2.0, 30.0, x, y, sizes)
+            else:
+                # az % 360 and the normalised zenith distance come precomputed
+                if self.mode == 'rect':
+                    x, y = star_arrays.az_mod360, alt
                 else:
-                    planet_spots.append({'pos': (x, y), 'size': 12, 'brush': pg.mkBrush(255, 255, 0), 'pen': pg.mkPen((255, 200, 0), width=1)})
-
-        # Add star scatter
-        if star_spots:
-            self.star_scatter = pg.ScatterPlotItem()
-            self.star_scatter.addPoints(star_spots)
-            self.plot.addItem(self.star_scatter)
-        
-        # Add planet scatter
-        if planet_spots:
-            self.planet_scatter = pg.ScatterPlotItem()
-            self.planet_scatter.addPoints(planet_spots)
-            self.plot.addItem(self.planet_scatter)
-
-        # Clear existing labels
-        for it in self._label_items:
-            try:
-                self.plot.removeItem(it)
-            except Exception:
-                pass
-        self._label_items = []
+                    az_rad = np.radians(az)
+                    x = star_arrays.zen_norm * np.sin(az_rad)
+                    y = star_arrays.zen_norm * np.cos(az_rad)
+                sizes = np.clip((6.0 - mag) * 3.5, 2.0, 30.0)
+            self._proj_x, self._proj_y, self._proj_mag, self._proj_size = x, y, mag, sizes
+            self._star_pos_by_id = dict(zip(star_arrays.ids.tolist(), zip(x.tolist(), y.tolist())))
+        else:
+            self._proj_x = self._proj_y = self._proj_mag = self._proj_size = np.empty(0, dtype=np.float32)
+
+        # Planets: same array form; the Moon gets a larger, bluish marker
+        n_planets = len(visible_planets)
+        p_alt = np.fromiter((p.alt_deg for p in visible_planets), dtype=np.float64, count=n_planets)
+        p_az = np.fromiter((p.az_deg for p in visible_planets), dtype=np.float64, count=n_planets)
+        is_moon = np.fromiter((getattr(p, 'name', '').lower() == 'moon' for p in visible_planets), dtype=bool, count=n_planets)
+        px, py = self._project_altaz(p_alt, p_az)
+        self._planet_x, self._planet_y = px, py
+        p_sizes = np.where(is_moon, 16.0, 12.0)
+
+        # GL mode draws markers only on the GL items; the hidden Qt scatters
+        # are not fed or binned.
+        if self.use_gl:
+            self._update_gl_scatter(self._proj_x, self._proj_y, self._proj_size, px, py, p_sizes, is_moon)
+            return
+        if n_stars:
+            self._set_star_scatter()
+        else:
+            self.star_scatter.clear()
+        if n_planets:
+            brushes = [self._moon_brush if m else self._planet_brush for m in is_moon.tolist()]
+            pens = [self._moon_pen if m else self._planet_pen for m in is_moon.tolist()]
+            self.planet_scatter.setData(x=px, y=py, size=p_sizes, brush=brushes, pen=pens)
+        else:
+            self.planet_scatter.clear()
+
+    def _set_star_scatter(self):
+        """Push the cached star projection to the scatter.
+
+        Dense fields are thinned to the brightest star per screen pixel; the
+        subset is recomputed only when the data or the view range changes.
+        """
+        x, y, sizes = self._proj_x, self._proj_y, self._proj_size
+        if x.size >= self._BIN_MIN_POINTS:
+            (x_min, x_max), (y_min, y_max) = self.plot.getViewBox().viewRange()
+            key = (x_min, x_max, y_min, y_max, self.plot.width(), self.plot.height())
+            cache = self._bin_cache
+            if (cache is not None and cache[0][0] is self._proj_source[0]
+                    and cache[0][1:] == self._proj_source[1:] and cache[1] == key):
+                keep = cache[2]
+            else:
+                keep = self._brightest_per_pixel(x, y, self._proj_mag)
+                self._bin_cache = (self._proj_source, key, keep)
+            x, y, sizes = x[keep], y[keep], sizes[keep]
+        self.star_scatter.setData(x=x, y=y, size=sizes, brush=self._star_brush, pen=None)
+
+    def _brightest_per_pixel(self, x: np.ndarray, y: np.ndarray, mag: np.ndarray) -> np.ndarray:
+        """Indices (in input order) of the brightest point in each screen pixel.
+
+        Points outside the view share one bin per edge row/column.
+        """
+        (x_min, x_max), (y_min, y_max) = self.plot.getViewBox().viewRange()
+        widget_w = max(1, self.plot.width())
+        widget_h = max(1, self.plot.height())
+        px = np.clip(((x - x_min) * (widget_w / (x_max - x_min))).astype(np.int32), -1, widget_w) + 1
+        py = np.clip(((y - y_min) * (widget_h / (y_max - y_min))).astype(np.int32), -1, widget_h) + 1
+        key = px.astype(np.int64) * (widget_h + 2) + py
+        # sort by bin, brightest first within a bin, then take each bin's first entry
+        order = np.lexsort((mag, key))
+        _, first = np.unique(key[order], return_index=True)
+        return np.sort(order[first])
+
+    def _on_view_range_changed(self, *_):
+        if not self.use_gl and self._proj_x.size >= self._BIN_MIN_POINTS:
+            self._set_star_scatter()
+
+    def _refresh_labels(self):
+        """Rebuild label items from the last update's visible objects.
+
+        Uses the cached projection, so label toggles and density changes do
+        not re-project stars or touch the scatters and constellations.
+        """
+        self._placed_labels = []
+        visible_idx = self._visible_idx.tolist()
+        visible_planets = self._visible_planets
+        visible_dso = self._visible_dso
 
         # Build label candidates and place them using greedy bounding-box avoidance
         candidates = []
         # planets/Moon: highest priority (0)
         if self.show_planet_labels:
-            for p in visible_planets:
-                if self.mode == 'rect':
-                    x = float(p.az_deg % 360.0)
-                    y = float(p.alt_deg)
-                else:
-                    az_rad = np.radians(p.az_deg)
-                    r = float(np.clip((90.0 - p.alt_deg) / 90.0, 0.0, 1.0))
-                    x = r * np.sin(az_rad)
-                    y = r * np.cos(az_rad)
+            for p, x, y in zip(visible_planets, self._planet_x.tolist(), self._planet_y.tolist()):
                 label = p.name
                 if getattr(p, 'name', '').lower() == 'moon' and getattr(p, 'phase_fraction', None) is not None:
                     label = f"{p.name} ({int(p.phase_fraction*100)}%)"
@@ -290,20 +504,14 @@ class SkyView2D(QtWidgets.QWidget):
         # stars: bright stars next (priority 1), optionally include others with lower priority
         if self.show_star_labels:
             max_star_labels = [5, 15, 40][self._label_density_index if hasattr(self, '_label_density_index') else 1]
-            bright = []
-            for s in visible_stars:
-                try:
-                    mag = getattr(s, 'mag', 99.0)
-                    if mag < min(self.limiting_magnitude, 6.0):
-                        pos = self._star_pos_by_id.get(s.id)
-                        if pos is None:
-                            continue
-                        priority = 1 if mag < 2.0 else 2
-                        bright.append({'id': s.id, 'x': pos[0], 'y': pos[1], 'text': s.name, 'priority': priority, 'mag': mag})
-                except Exception:
-                    continue
-            bright.sort(key=lambda c: c.get('mag', 99.0))
-            candidates.extend(bright[:max_star_labels])
+            mag_arr = self._proj_mag
+            bright_idx = _brightest_indices(mag_arr, min(self.limiting_magnitude, 6.0), max_star_labels)
+            xs = self._proj_x[bright_idx].tolist()
+            ys = self._proj_y[bright_idx].tolist()
+            for i, x, y, mag in zip(bright_idx.tolist(), xs, ys, mag_arr[bright_idx].tolist()):
+                s = self._last_stars[visible_idx[i]]
+                priority = 1 if mag < 2.0 else 2
+                candidates.append({'id': s.id, 'x': x, 'y': y, 'text': s.name, 'priority': priority, 'mag': mag})
         # Deep sky objects (low priority)
         if self.show_dso:
             max_dso_labels = [0, 5, 15][self._label_density_index if hasattr(self, '_label_density_index') else 1]
@@ -321,36 +529,32 @@ class SkyView2D(QtWidgets.QWidget):
                 except Exception:
                     continue
 
-        # Occupied rects start empty; we could seed with star/planet marker boxes if desired
-        occupied = []
+        # Placed label rects in a uniform spatial hash (cell -> rects) so each
+        # candidate only tests its neighbours; shared by the planet, star and
+        # DSO passes. Cells are sized from a typical label box.
+        occupied_grid = {}
 
-        def _font_metrics():
-            return QFontMetrics(QtWidgets.QApplication.font())
+        # Font metrics and the data-per-pixel scale are fixed for this redraw,
+        # so compute them once rather than per candidate/offset.
+        fm = QFontMetrics(self._label_font)
+        pixel_h = fm.height()
+        try:
+            vr = self.plot.getViewBox().viewRange()
+            x_min, x_max = vr[0][0], vr[0][1]
+            y_min, y_max = vr[1][0], vr[1][1]
+        except Exception:
+            # fallback ranges used earlier
+            if self.mode == 'rect':
+                x_min, x_max = 0.0, 360.0
+                y_min, y_max = 0.0, 90.0
+            else:
+                x_min, x_max = -1.05, 1.05
+                y_min, y_max = -1.05, 1.05
+        scale_x = (x_max - x_min) / max(1, self.plot.width())
+        scale_y = (y_max - y_min) / max(1, self.plot.height())
 
-        def _estimate_label_rect(xc, yc, text, offset_x=0.0, offset_y=0.0):
-            # Estimate label size in data coordinates using font metrics and plot view range
-            fm = _font_metrics()
-            pixel_w = fm.horizontalAdvance(text)
-            pixel_h = fm.height()
-            # view ranges
-            try:
-                vr = self.plot.getViewBox().viewRange()
-                x_min, x_max = vr[0][0], vr[0][1]
-                y_min, y_max = vr[1][0], vr[1][1]
-            except Exception:
-                # fallback ranges used earlier
-                if self.mode == 'rect':
-                    x_min, x_max = 0.0, 360.0
-                    y_min, y_max = 0.0, 90.0
-                else:
-                    x_min, x_max = -1.05, 1.05
-                    y_min, y_max = -1.05, 1.05
-            data_w = x_max - x_min
-            data_h = y_max - y_min
-            widget_w = max(1, self.plot.width())
-            widget_h = max(1, self.plot.height())
-            scale_x = data_w / widget_w
-            scale_y = data_h / widget_h
+        def _estimate_label_rect(xc, yc, pixel_w, offset_x=0.0, offset_y=0.0, scale_x=scale_x, scale_y=scale_y, pixel_h=pixel_h):
+            # Label size in data coordinates from its pixel width and the view scale
             lab_w = pixel_w * scale_x
             lab_h = pixel_h * scale_y
             # Anchor label top-left at (xc + offset_x, yc + offset_y)
@@ -369,6 +573,26 @@ class SkyView2D(QtWidgets.QWidget):
             # rect: (l,t,r,b)
             return not (a[2] <= b[0] or a[0] >= b[2] or a[3] <= b[1] or a[1] >= b[3])
 
+        probe = _estimate_label_rect(0.0, 0.0, fm.horizontalAdvance('M' * 8))
+        cell_w = max(probe[2] - probe[0], 1e-6)
+        cell_h = max(probe[3] - probe[1], 1e-6)
+
+        def _cells(rect):
+            for cx in range(int(rect[0] // cell_w), int(rect[2] // cell_w) + 1):
+                for cy in range(int(rect[1] // cell_h), int(rect[3] // cell_h) + 1):
+                    yield (cx, cy)
+
+        def _collides(rect):
+            for cell in _cells(rect):
+                for occ in occupied_grid.get(cell, ()):
+                    if _rects_intersect(rect, occ):
+                        return True
+            return False
+
+        def _occupy(rect):
+            for cell in _cells(rect):
+                occupied_grid.setdefault(cell, []).append(rect)
+
         def _place_labels_greedy(candidates_list):
             placed_labels = []
             # sort by priority (low number = higher priority) and optional magnitude for stars
@@ -386,57 +610,64 @@ class SkyView2D(QtWidgets.QWidget):
                 base_x = c['x']
                 base_y = c['y']
                 placed = False
+                # label width does not depend on the offset tried
+                pixel_w = fm.horizontalAdvance(c['text'])
                 for offx, offy in offsets:
-                    rect = _estimate_label_rect(base_x, base_y, c['text'], offset_x=offx, offset_y=offy)
-                    collision = False
-                    for occ in occupied:
-                        if _rects_intersect(rect, occ):
-                            collision = True
-                            break
-                    if not collision:
-                        occupied.append(rect)
+                    rect = _estimate_label_rect(base_x, base_y, pixel_w, offset_x=offx, offset_y=offy)
+                    if not _collides(rect):
+                        _occupy(rect)
                         placed_labels.append({'x': rect[0], 'y': rect[1], 'text': c['text'], 'src': c})
                         placed = True
                         break
                 # If not placed and low priority (e.g., priority >=2), skip
                 if not placed and c.get('priority', 10) <= 1:
                     # try to force at base location even if overlapping for high priority
-                    rect = _estimate_label_rect(base_x, base_y, c['text'], offset_x=0.0, offset_y=0.0)
-                    occupied.append(rect)
+                    rect = _estimate_label_rect(base_x, base_y, pixel_w, offset_x=0.0, offset_y=0.0)
+                    _occupy(rect)
                     placed_labels.append({'x': rect[0], 'y': rect[1], 'text': c['text'], 'src': c})
             return placed_labels
 
         placed = _place_labels_greedy(candidates)
         self._placed_labels = placed
-        # Create TextItems for placed labels
-        for pl in placed:
-            try:
+        self._show_labels(placed)
+
+    def _show_labels(self, placed: list):
+        """Show `placed` labels using pooled TextItems; hide the unused ones."""
+        pool = self._label_pool
+        for i, pl in enumerate(placed):
+            if i < len(pool):
+                txt = pool[i]
+                if txt.toPlainText() != pl['text']:
+                    txt.setText(pl['text'])
+            else:
                 txt = pg.TextItem(text=pl['text'], color=(255, 220, 220), anchor=(0, 0))
-                txt.setFont(QtWidgets.QApplication.font())
-                txt.setPos(pl['x'], pl['y'])
+                txt.setFont(self._label_font)
                 self.plot.addItem(txt)
-                self._label_items.append(txt)
-            except Exception:
-                continue
-        # If constellation segments are present, draw them
-        if self.constellation_segments:
-            self.update_constellations(self.constellation_segments)
-        # Grids and overlays
-        self._draw_overlays()
+                pool.append(txt)
+            txt.setPos(pl['x'], pl['y'])
+            txt.setVisible(True)
+        for txt in pool[len(placed):]:
+            txt.setVisible(False)
+        self._label_items = pool[:len(placed)]
 
     def export_png(self, path, width: int = 2000, height: int = 2000):
         """Export the current widget view to a PNG at the requested resolution."""
-        # Grab the plot widget as a pixmap and scale to desired size
-        # Use devicePixelRatio scaling for HiDPI if available
-        pm: QPixmap = self.plot.grab()
-        # scale while keeping aspect ratio stable
-        pm = pm.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        # Render the scene straight into an image at the export size (vector
+        # output, no upscaling of a screen grab), keeping the view's aspect.
+        source = self.plot.viewport().rect()
+        scale = min(width / max(1, source.width()), height / max(1, source.height()))
+        pm = QtGui.QImage(max(1, round(source.width() * scale)), max(1, round(source.height() * scale)), QtGui.QImage.Format_ARGB32_Premultiplied)
+        pm.fill(Qt.black)
+        painter = QtGui.QPainter(pm)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        self.plot.render(painter, QtCore.QRectF(0, 0, pm.width(), pm.height()), source)
+        painter.end()
         # composite labels if we have placed positions
         if self._placed_labels:
             painter = QtGui.QPainter(pm)
             painter.setRenderHint(QtGui.QPainter.Antialiasing)
             painter.setPen(QtGui.QColor(220, 220, 255))
-            painter.setFont(QtWidgets.QApplication.font())
+            painter.setFont(self._label_font)
             # Derive scaling between current view range and export size
             try:
                 vr = self.plot.getViewBox().viewRange()
@@ -484,7 +715,8 @@ class SkyView2D(QtWidgets.QWidget):
         x = data_pos.x()
         y = data_pos.y()
         best = None
-        best_dist = tol_px
+        # compare squared pixel distances; no sqrt per candidate
+        best_d2 = tol_px * tol_px
         # Build screen positions if not cached
         if not self._last_screen_map and self._last_stars:
             for s in self._last_stars:
@@ -503,9 +735,9 @@ class SkyView2D(QtWidgets.QWidget):
                 scene_pt = vb.mapViewToScene(pg.Point(sp[0], sp[1]))
             dx = scene_pos.x() - scene_pt.x()
             dy = scene_pos.y() - scene_pt.y()
-            dist = (dx * dx + dy * dy) ** 0.5
-            if dist < best_dist:
-                best_dist = dist
+            d2 = dx * dx + dy * dy
+            if d2 < best_d2:
+                best_d2 = d2
                 best = ('star', s)
         # planets
         for p in self._last_planets:
@@ -522,9 +754,9 @@ class SkyView2D(QtWidgets.QWidget):
             scene_pt = vb.mapViewToScene(pg.Point(vx, vy))
             dx = scene_pos.x() - scene_pt.x()
             dy = scene_pos.y() - scene_pt.y()
-            dist = (dx * dx + dy * dy) ** 0.5
-            if dist < best_dist:
-                best_dist = dist
+            d2 = dx * dx + dy * dy
+            if d2 < best_d2:
+                best_d2 = d2
                 best = ('planet', p)
         # dso
         for d in self._last_dso:
@@ -541,14 +773,28 @@ class SkyView2D(QtWidgets.QWidget):
             scene_pt = vb.mapViewToScene(pg.Point(vx, vy))
             dx = scene_pos.x() - scene_pt.x()
             dy = scene_pos.y() - scene_pt.y()
-            dist = (dx * dx + dy * dy) ** 0.5
-            if dist < best_dist:
-                best_dist = dist
+            d2 = dx * dx + dy * dy
+            if d2 < best_d2:
+                best_d2 = d2
                 best = ('dso', d)
         return best
 
+    def _remove_items(self, items: list) -> list:
+        """Remove `items` from the plot and return an empty list to store back."""
+        for it in items:
+            try:
+                self.plot.removeItem(it)
+            except Exception:
+                pass
+        return []
+
+    def _add_overlay(self, item):
+        self.plot.addItem(item)
+        self.overlay_items.append(item)
+
     def _draw_overlays(self):
         """Draw grids, ecliptic/meridian, and FOV circle if enabled."""
+        self.overlay_items = self._remove_items(self.overlay_items)
         if self.mode != 'rect':
             return
         # Alt/Az grid
@@ -557,28 +803,28 @@ class SkyView2D(QtWidgets.QWidget):
             for az in range(0, 361, 30):
                 x = [az, az]
                 y = [0, 90]
-                self.plot.addItem(pg.PlotDataItem(x, y, pen=pen))
+                self._add_overlay(pg.PlotDataItem(x, y, pen=pen))
             for alt in range(10, 90, 10):
                 x = [0, 360]
                 y = [alt, alt]
-                self.plot.addItem(pg.PlotDataItem(x, y, pen=pen))
+                self._add_overlay(pg.PlotDataItem(x, y, pen=pen))
         # RA/Dec grid (approx by treating az as RA proxy for visualization)
         if self.show_ra_dec_grid:
             pen = pg.mkPen((100, 120, 160, 100))
             for ra in range(0, 361, 30):
-                self.plot.addItem(pg.PlotDataItem([ra, ra], [0, 90], pen=pen))
+                self._add_overlay(pg.PlotDataItem([ra, ra], [0, 90], pen=pen))
             for dec in range(10, 90, 20):
-                self.plot.addItem(pg.PlotDataItem([0, 360], [dec, dec], pen=pen))
+                self._add_overlay(pg.PlotDataItem([0, 360], [dec, dec], pen=pen))
         # Meridian line (Az=180)
         if self.show_meridian:
             pen = pg.mkPen((200, 120, 120, 150), width=2)
-            self.plot.addItem(pg.PlotDataItem([180, 180], [0, 90], pen=pen))
+            self._add_overlay(pg.PlotDataItem([180, 180], [0, 90], pen=pen))
         # Ecliptic (simple sinusoid placeholder)
         if self.show_ecliptic:
             az = np.linspace(0, 360, 200)
             alt = 30 * np.sin(np.radians(az))
             pen = pg.mkPen((200, 200, 120, 140), width=2)
-            self.plot.addItem(pg.PlotDataItem(az, alt, pen=pen))
+            self._add_overlay(pg.PlotDataItem(az, alt, pen=pen))
         # FOV circle
         if self.fov_radius_deg is not None:
             pen = pg.mkPen((120, 200, 200, 180), width=2, style=Qt.DashLine)
@@ -591,26 +837,23 @@ class SkyView2D(QtWidgets.QWidget):
             az = np.linspace(0, 360, 200)
             x = (az_center + self.fov_radius_deg * np.sin(np.radians(az))) % 360
             y = alt_center + self.fov_radius_deg * np.cos(np.radians(az))
-            self.plot.addItem(pg.PlotDataItem(x, y, pen=pen))
+            self._add_overlay(pg.PlotDataItem(x, y, pen=pen))
 
     def set_show_star_labels(self, flag: bool):
         """Enable/disable star labels (bright stars only)."""
         self.show_star_labels = bool(flag)
-        # redraw if we have cached data
-        if self._last_stars or self._last_planets:
-            self.update_sky(self._last_stars, self._last_planets)
+        # only the labels change; the projection from the last update is reused
+        self._refresh_labels()
 
     def set_show_planet_labels(self, flag: bool):
         """Enable/disable planet labels (all visible planets)."""
         self.show_planet_labels = bool(flag)
-        if self._last_stars or self._last_planets:
-            self.update_sky(self._last_stars, self._last_planets)
+        self._refresh_labels()
 
     def set_label_density(self, idx: int):
         """Set label density tier (0,1,2)."""
         self._label_density_index = max(0, min(int(idx), 2))
-        if self._last_stars or self._last_planets:
-            self.update_sky(self._last_stars, self._last_planets, self._last_dso)
+        self._refresh_labels()
 
     def set_overlays(self, ra_dec: bool, alt_az: bool, ecliptic: bool, meridian: bool):
         """Configure grid/line overlays."""
@@ -618,23 +861,27 @@ class SkyView2D(QtWidgets.QWidget):
         self.show_alt_az_grid = bool(alt_az)
         self.show_ecliptic = bool(ecliptic)
         self.show_meridian = bool(meridian)
+        self._view_version += 1
         if self._last_stars or self._last_planets:
             self.update_sky(self._last_stars, self._last_planets, self._last_dso)
 
     def set_fov_radius(self, radius_deg: float | None):
         """Set FOV radius overlay (deg). None disables."""
         self.fov_radius_deg = radius_deg
+        self._view_version += 1
         if self._last_stars or self._last_planets:
             self.update_sky(self._last_stars, self._last_planets, self._last_dso)
 
     def set_fov_center(self, az_deg: float, alt_deg: float):
         """Set the FOV overlay center (Az/Alt)."""
         self._fov_center = (az_deg, alt_deg)
+        self._view_version += 1
         if self._last_stars or self._last_planets:
             self.update_sky(self._last_stars, self._last_planets, self._last_dso)
 
     def clear_fov_center(self):
         self._fov_center = None
+        self._view_version += 1
 
     def set_projection_mode(self, mode: str):
         """Set projection mode: 'rect' or 'dome' and redraw current sky.
@@ -644,7 +891,14 @@ class SkyView2D(QtWidgets.QWidget):
         """
         if mode not in ('rect', 'dome'):
             raise ValueError("mode must be 'rect' or 'dome'")
+        if mode != self.mode:
+            # label positions are mode-specific; start the pool afresh
+            self._label_pool = self._remove_items(self._label_pool)
+            self._label_items = []
         self.mode = mode
+        self._configure_axes()
+        if self.use_gl:
+            self._configure_gl_camera()
         # Note: caller should call `update_sky` after switching to provide star list.
 
     def update_constellations(self, segments: list):
@@ -656,22 +910,20 @@ class SkyView2D(QtWidgets.QWidget):
         """
         # store segments for redraws
         self.constellation_segments = segments
-        # remove existing items
-        for it in self.constellation_items:
-            try:
-                self.plot.removeItem(it)
-            except Exception:
-                pass
-        self.constellation_items = []
-
-        pen = pg.mkPen((180, 180, 255, 120), width=1)
+        pairs = []
         for s1, s2 in segments:
             p1 = self._star_pos_by_id.get(s1.id)
             p2 = self._star_pos_by_id.get(s2.id)
             if p1 is None or p2 is None:
                 continue
-            x = [p1[0], p2[0]]
-            y = [p1[1], p2[1]]
-            line = pg.PlotDataItem(x, y, pen=pen)
-            self.plot.addItem(line)
-            self.constellation_items.append(line)
+            pairs.append((p1, p2))
+        if not pairs:
+            self.constellation_item.clear()
+            return
+        # one (x1, x2, nan) triple per segment so a single curve draws them all
+        pts = np.asarray(pairs, dtype=np.float64)  # (n, 2 endpoints, xy)
+        xs = np.full((len(pairs), 3), np.nan)
+        ys = np.full((len(pairs), 3), np.nan)
+        xs[:, :2] = pts[:, :, 0]
+        ys[:, :2] = pts[:, :, 1]
+        self.constellation_item.setData(xs.ravel(), ys.ravel(), connect='finite')
@@ -5,10 +5,18 @@ and draws constellation lines. This module is only imported when
 opengl_utils.opengl_available() returns True.
 """
 
+import logging
+from collections import OrderedDict
+
 import numpy as np
 from PyQt5 import QtWidgets, QtCore, QtGui
 from PyQt5.QtCore import Qt
 
+from .kernels import greedy_placement_kernel, segment_assembly_kernel
+from .sky_model import StarArrays
+
+logger = logging.getLogger(__name__)
+
 OPENGL_AVAILABLE = False
 
 try:
@@ -18,6 +26,86 @@ try:
 except ImportError:
     pass
 
+# placeholders for scatters with nothing to show
+_EMPTY_POS = np.empty((0, 3), dtype=np.float32)
+_EMPTY_SIZE = np.empty(0, dtype=np.float32)
+# uniform marker colours, passed as one RGBA tuple instead of (N, 4) arrays
+_STAR_COLOR = (1.0, 1.0, 1.0, 1.0)
+_PLANET_COLOR = (1.0, 1.0, 0.0, 1.0)
+_MOON_COLOR = (0.8, 0.8, 1.0, 1.0)
+# edge count from which the compiled segment gather beats NumPy's
+# take + mask + fancy-index chain
+_SEGMENT_KERNEL_MIN = 500
+# pending-work bits for SkyView3D's coalesced redraw
+_DIRTY_STARS = 1
+_DIRTY_CONSTELLATIONS = 2
+_DIRTY_LABELS = 4
+
+# overlay label colours by candidate priority (0 = planets, 3 = DSOs)
+_LABEL_COLORS = {0: QtGui.QColor(255, 220, 80), 3: QtGui.QColor(120, 180, 255)}
+_LABEL_COLOR_DEFAULT = QtGui.QColor(220, 220, 255)
+
+
+class _OverlayLabelWidget(QtWidgets.QWidget):
+    """Transparent overlay that paints all 3D view labels in one QPainter pass.
+
+    Items are ``(x, y, text, QColor)`` with (x, y) the top-left of the text.
+    Each distinct (text, colour) is rendered to a small pixmap once and then
+    blitted, so glyph shaping only happens for texts not seen before.
+    """
+
+    _PIXMAP_CACHE_SIZE = 2048
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setAttribute(Qt.WA_NoSystemBackground)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self._items = []
+        self._font = QtGui.QFont()
+        # (text, rgba) -> QPixmap, least recently used first
+        self._pixmap_cache = OrderedDict()
+
+    def set_labels(self, items: list, font: QtGui.QFont | None = None):
+        if font is not None and font != self._font:
+            self._font = font
+            self._pixmap_cache.clear()
+        if items or self._items:
+            self._items = items
+            self.update()
+
+    def _label_pixmap(self, text: str, color: QtGui.QColor, fm: QtGui.QFontMetrics) -> QtGui.QPixmap:
+        key = (text, color.rgba())
+        pm = self._pixmap_cache.get(key)
+        if pm is not None:
+            self._pixmap_cache.move_to_end(key)
+            return pm
+        dpr = self.devicePixelRatioF()
+        w = fm.horizontalAdvance(text) + 2
+        h = fm.height() + 2
+        pm = QtGui.QPixmap(int(np.ceil(w * dpr)), int(np.ceil(h * dpr)))
+        pm.setDevicePixelRatio(dpr)
+        pm.fill(Qt.transparent)
+        painter = QtGui.QPainter(pm)
+        painter.setFont(self._font)
+        painter.setPen(color)
+        painter.drawText(1, fm.ascent() + 1, text)
+        painter.end()
+        self._pixmap_cache[key] = pm
+        if len(self._pixmap_cache) > self._PIXMAP_CACHE_SIZE:
+            self._pixmap_cache.popitem(last=False)
+        return pm
+
+    def paintEvent(self, event):
+        if not self._items:
+            return
+        fm = QtGui.QFontMetrics(self._font)
+        painter = QtGui.QPainter(self)
+        # pixmaps carry a one pixel margin around the text
+        for x, y, text, color in self._items:
+            painter.drawPixmap(x - 1, y - 1, self._label_pixmap(text, color, fm))
+        painter.end()
+
 
 class SkyView3D(QtWidgets.QWidget):
     """3D hemispherical sky dome viewer using OpenGL.
@@ -54,13 +142,38 @@ class SkyView3D(QtWidgets.QWidget):
         layout.addWidget(self.glview)
         self.setLayout(layout)
 
-        # Current star and planet scatter plots and constellation lines
-        self.star_scatter = None
-        self.planet_scatter = None
-        self.constellation_lines = []
+        # Star and planet scatter plots and the constellation lines live for
+        # the widget's lifetime and are refreshed with setData
+        self.star_scatter = self._set_scatter(None, _EMPTY_POS, _EMPTY_SIZE, _STAR_COLOR)
+        self.planet_scatter = self._set_scatter(None, _EMPTY_POS, _EMPTY_SIZE, _PLANET_COLOR)
+        self._constellation_lines_item = GLLinePlotItem(
+            pos=_EMPTY_POS,
+            color=(0.7, 0.7, 1.0, 0.3),  # Faint blue
+            width=1,
+            antialias=True,
+            mode='lines'
+        )
+        self.glview.addItem(self._constellation_lines_item)
         self._stars_cache = []
         self._planets_cache = []
         self._dso_cache = []
+        # column arrays of the visible stars, their dome positions (N, 3) and
+        # the sorted star ids with their rows (for id -> row lookups), shared
+        # by the scatter and constellation lines
+        self._star_arrays = StarArrays.from_stars([])
+        self._star_pos = np.zeros((0, 3), dtype=np.float32)
+        self._star_ids_sorted = np.empty(0, dtype=np.int64)
+        self._star_id_rows = np.empty(0, dtype=np.intp)
+        # constellation segments as an (M, 2) star-id table; rebuilt only
+        # when a different segment list is passed in
+        self._segments = None
+        self._seg_ids = np.empty((0, 2), dtype=np.int64)
+        # float32 position/size/planet RGBA buffers reused across redraws,
+        # grown on demand; the scatters receive slices of them (stars share
+        # the single _STAR_COLOR tuple)
+        self._pos_buf = np.empty((0, 3), dtype=np.float32)
+        self._size_buf = np.empty(0, dtype=np.float32)
+        self._planet_color_buf = np.empty((0, 4), dtype=np.float32)
         # Label flags
         self.show_star_labels = False
         self.show_planet_labels = False
@@ -72,127 +185,252 @@ class SkyView3D(QtWidgets.QWidget):
         self.show_meridian = False
 
         # Overlay widget for 2D labels (transparent)
-        self._overlay = QtWidgets.QWidget(self)
-        self._overlay.setAttribute(Qt.WA_TransparentForMouseEvents)
-        self._overlay.setAttribute(Qt.WA_NoSystemBackground)
-        self._overlay.setStyleSheet('background: transparent;')
+        self._overlay = _OverlayLabelWidget(self)
         self._overlay.raise_()
-        self._overlay_labels = []
-
-    def _altaz_to_xyz(self, alt_deg: np.ndarray, az_deg: np.ndarray) -> tuple:
+        # label fonts by point size, shared by the overlay and exports
+        self._label_fonts = {}
+        # QStaticText per label text for PNG exports, valid for one font
+        self._static_text_font = None
+        self._static_text_cache = {}
+        # inputs of the last overlay rebuild; equal key -> labels unchanged
+        self._overlay_key = None
+        # single-shot timer coalescing resize-driven label refreshes
+        self._overlay_timer = QtCore.QTimer(self)
+        self._overlay_timer.setSingleShot(True)
+        self._overlay_timer.timeout.connect(self._refresh_overlay_labels)
+        # update_sky / update_constellations / label setters only record what
+        # changed; one zero-delay timer does the work once per event-loop pass
+        self._dirty = 0
+        self._pending_sky = None
+        self._coalesce_timer = QtCore.QTimer(self)
+        self._coalesce_timer.setSingleShot(True)
+        self._coalesce_timer.timeout.connect(self._flush)
+
+    def _altaz_to_xyz(self, alt_deg: np.ndarray, az_deg: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
         """Convert Alt/Az (deg) to 3D Cartesian on unit hemisphere.
 
         Zenith = (0, 0, 1), Horizon = z=0.
         Azimuth 0 = North (+y), 90 = East (+x), 180 = South (-y), 270 = West (-x).
+        Returns an (N, 3) float32 array, written into `out` when given.
         """
-        alt_rad = np.radians(alt_deg)
-        az_rad = np.radians(az_deg)
-
-        # Spherical coords: r=1, theta=az, phi=(90-alt)
-        r = np.cos(alt_rad)
-        z = np.sin(alt_rad)
-        x = r * np.sin(az_rad)
-        y = r * np.cos(az_rad)
-        return x, y, z
-
-    def _compute_screen_coords_for_altaz(self, alt_deg: float, az_deg: float, width: int, height: int):
-        """Map a single Alt/Az point to overlay pixel coordinates.
+        n = np.shape(alt_deg)[0]
+        pos = np.empty((n, 3), dtype=np.float32) if out is None else out
+        deg = np.float32(np.pi / 180.0)
+        alt_rad = np.multiply(alt_deg, deg, dtype=np.float32)
+        az_rad = np.multiply(az_deg, deg, dtype=np.float32)
+
+        # Spherical coords: r=cos(alt) in the horizon plane, z=sin(alt)
+        np.sin(alt_rad, out=pos[:, 2])
+        r = np.cos(alt_rad, out=alt_rad)
+        np.sin(az_rad, out=pos[:, 0])
+        pos[:, 0] *= r
+        np.cos(az_rad, out=pos[:, 1])
+        pos[:, 1] *= r
+        return pos
+
+    def _compute_screen_coords_batch(self, alt_deg, az_deg, width: int, height: int):
+        """Map Alt/Az arrays (deg) to overlay pixel coordinates.
 
         Uses the same dome projection as the 2D dome view: radial distance r=(90-alt)/90,
         then maps to pixel coordinates centered in the overlay with a scale factor.
-        Returns (px, py) as integers.
+        Returns (px, py) as int32 arrays.
         """
-        az_rad = np.radians(az_deg)
-        r = float(np.clip((90.0 - alt_deg) / 90.0, 0.0, 1.0))
-        x = r * np.sin(az_rad)
-        y = r * np.cos(az_rad)
+        alt = np.asarray(alt_deg, dtype=np.float64)
+        az_rad = np.radians(np.asarray(az_deg, dtype=np.float64))
+        r = np.clip((90.0 - alt) / 90.0, 0.0, 1.0)
         cx = width / 2.0
         cy = height / 2.0
         scale = 0.45 * min(width, height)
-        px = int(cx + scale * x)
-        py = int(cy - scale * y)
+        px = (cx + scale * (r * np.sin(az_rad))).astype(np.int32)
+        py = (cy - scale * (r * np.cos(az_rad))).astype(np.int32)
         return px, py
 
+    @staticmethod
+    def _altaz_columns(objs):
+        """(alt_deg, az_deg) float64 arrays for a list of objects with those attributes."""
+        n = len(objs)
+        return (np.fromiter((o.alt_deg for o in objs), dtype=np.float64, count=n),
+                np.fromiter((o.az_deg for o in objs), dtype=np.float64, count=n))
+
     def _place_labels_greedy_pixels(self, candidates, width, height, font: QtGui.QFont):
         """Place labels (pixel coords) using a greedy bounding-box avoidance.
 
-        candidates: list of dicts with keys: 'id','px','py','text','priority'
-        Returns list of placed dicts with keys 'x','y','text','src' where x,y are
+        candidates: list of tuples ``(priority, mag, seq, px, py, text, id)``;
+        ``seq`` is the insertion index, keeping ties in insertion order, so a
+        plain ``sort()`` compares tuples without a key function.
+        Returns list of placed dicts with keys 'x','y','text','priority' where x,y are
         the top-left pixel coordinates to place the QLabel / drawText.
         """
         fm = QtGui.QFontMetrics(font)
+        # text widths are memoized per label; the line height is fixed
+        adv_cache = {}
+        fh = fm.height()
+
+        def _advance(text):
+            w = adv_cache.get(text)
+            if w is None:
+                w = adv_cache[text] = fm.horizontalAdvance(text)
+            return w
+
+        # sort by priority then (for stars) magnitude; non-stars carry mag 0
+        candidates.sort()
+
+        kernel = greedy_placement_kernel()
+        if kernel is not None and candidates:
+            # compiled placer over integer columns; text widths measured here
+            priority, _mag, _seq, cand_x, cand_y, texts, _id = zip(*candidates)
+            n = len(candidates)
+            out = np.empty((3, n), dtype=np.int32)
+            kernel(np.asarray(cand_x, dtype=np.int32), np.asarray(cand_y, dtype=np.int32),
+                   np.fromiter((_advance(t) for t in texts), dtype=np.int32, count=n),
+                   fh, np.asarray(priority, dtype=np.int32), int(width), int(height),
+                   out[0], out[1], out[2])
+            xs, ys = out[0].tolist(), out[1].tolist()
+            return [{'x': xs[i], 'y': ys[i], 'text': texts[i], 'priority': priority[i]}
+                    for i in np.flatnonzero(out[2]).tolist()]
+
         def _rect_for_text(cand_x, cand_y, text, offx=0, offy=0):
             left = cand_x + 6 + offx
             top = cand_y - 6 + offy
-            w = fm.horizontalAdvance(text)
-            h = fm.height()
-            return (left, top, left + w, top + h)
+            w = _advance(text)
+            return (left, top, left + w, top + fh)
 
         def _intersect(a, b):
             return not (a[2] <= b[0] or a[0] >= b[2] or a[3] <= b[1] or a[1] >= b[3])
 
         placed = []
-        occupied = []
-        # sort by priority then (for stars) magnitude if provided
-        candidates.sort(key=lambda c: (c.get('priority', 10), c.get('mag', 0)))
+        # placed rects in a uniform grid (cell -> rects), cells about one text
+        # line high, so a candidate only tests the rects in cells it overlaps
+        occupied_grid = {}
+        cell = max(1, fh)
+
+        def _cells(rect):
+            for gx in range(rect[0] // cell, rect[2] // cell + 1):
+                for gy in range(rect[1] // cell, rect[3] // cell + 1):
+                    yield (gx, gy)
+
+        def _occupy(rect):
+            for key in _cells(rect):
+                occupied_grid.setdefault(key, []).append(rect)
 
         offsets = [(0, 0), (12, 0), (-12, 0), (0, 12), (0, -12), (12, 12), (-12, 12), (12, -12), (-12, -12)]
-        for c in candidates:
-            cand_x = int(c['px'])
-            cand_y = int(c['py'])
-            text = c['text']
+        for priority, _mag, _seq, cand_x, cand_y, text, _id in candidates:
+            cand_x = int(cand_x)
+            cand_y = int(cand_y)
             placed_ok = False
             for offx, offy in offsets:
                 rect = _rect_for_text(cand_x, cand_y, text, offx, offy)
                 # skip if out of bounds
                 if rect[0] < 0 or rect[1] < 0 or rect[2] > width or rect[3] > height:
                     continue
-                collision = False
-                for occ in occupied:
-                    if _intersect(rect, occ):
-                        collision = True
-                        break
+                collision = any(_intersect(rect, occ) for key in _cells(rect) for occ in occupied_grid.get(key, ()))
                 if not collision:
-                    occupied.append(rect)
-                    placed.append({'x': rect[0], 'y': rect[1], 'text': text, 'src': c})
+                    _occupy(rect)
+                    placed.append({'x': rect[0], 'y': rect[1], 'text': text, 'priority': priority})
                     placed_ok = True
                     break
             # if not placed and high priority, force at base position
-            if not placed_ok and c.get('priority', 10) <= 1:
+            if not placed_ok and priority <= 1:
                 rect = _rect_for_text(cand_x, cand_y, text, 0, 0)
-                occupied.append(rect)
-                placed.append({'x': rect[0], 'y': rect[1], 'text': text, 'src': c})
+                _occupy(rect)
+                placed.append({'x': rect[0], 'y': rect[1], 'text': text, 'priority': priority})
 
         return placed
 
+    def _label_font(self, width: int, height: int) -> QtGui.QFont:
+        """Label font for a `width` x `height` target, cached per point size."""
+        pt = max(8, int(min(width, height) / 200))
+        font = self._label_fonts.get(pt)
+        if font is None:
+            font = self._label_fonts[pt] = QtGui.QFont()
+            font.setPointSize(pt)
+        return font
+
+    def _set_scatter(self, item, pos, size, color):
+        """Update a persistent GLScatterPlotItem, creating it on first use.
+
+        Reusing the item via setData keeps its GL buffers instead of
+        rebuilding them on every redraw. Returns the (possibly new) item.
+        """
+        # float32 C-contiguous arrays go to the VBO without a conversion copy
+        assert pos.dtype == np.float32 and pos.flags.c_contiguous
+        assert size.dtype == np.float32 and size.flags.c_contiguous
+        if item is None:
+            item = GLScatterPlotItem(pos=pos, size=size, color=color, pxMode=True)
+            self.glview.addItem(item)
+        else:
+            item.setData(pos=pos, size=size, color=color)
+        return item
+
     def _mag_to_size(self, mag: float) -> float:
-        """Map magnitude to marker size (brighter = larger)."""
-        size = (6.0 - mag) * 0.5
-        return float(np.clip(size, 0.02, 0.3))
+        """Map magnitude to marker size in pixels (brighter = larger)."""
+        size = (6.0 - mag) * 2.0
+        return float(np.clip(size, 1.0, 12.0))
+
+    def _schedule(self, flags: int):
+        """Mark `flags` dirty and redraw on the next event-loop pass."""
+        self._dirty |= flags
+        self._coalesce_timer.start(0)
+
+    def _flush(self):
+        """Apply all pending updates: stars, then constellations, then labels."""
+        self._coalesce_timer.stop()
+        flags, self._dirty = self._dirty, 0
+        if flags & _DIRTY_STARS:
+            sky, self._pending_sky = self._pending_sky, None
+            self._rebuild_sky(*sky)
+        # both follow the star positions
+        if flags & (_DIRTY_STARS | _DIRTY_CONSTELLATIONS):
+            self.redraw_constellations()
+        if flags & (_DIRTY_STARS | _DIRTY_LABELS):
+            self._refresh_overlay_labels()
+
+    def update_sky(self, stars: list, planets: list = None, deep_sky: list = None, star_arrays: StarArrays | None = None):
+        """Redraw stars and planets from lists of dataclass objects.
+
+        `star_arrays` (e.g. ``SkySnapshot.star_arrays``) are column arrays
+        parallel to `stars`; when omitted they are built from the list.
+        The redraw runs on the next event-loop pass; back-to-back calls
+        collapse into one.
+        """
+        self._pending_sky = (stars, planets, deep_sky, star_arrays)
+        self._schedule(_DIRTY_STARS)
 
-    def update_sky(self, stars: list, planets: list = None, deep_sky: list = None):
-        """Redraw stars and planets from lists of dataclass objects."""
+    def _rebuild_sky(self, stars: list, planets: list = None, deep_sky: list = None, star_arrays: StarArrays | None = None):
+        """Rebuild the star/planet scatters and visible-object caches."""
         if planets is None:
             planets = []
         if deep_sky is None:
             deep_sky = []
             
-        # Remove old scatter
-        if self.star_scatter is not None:
-            self.glview.removeItem(self.star_scatter)
-            self.star_scatter = None
-        if self.planet_scatter is not None:
-            self.glview.removeItem(self.planet_scatter)
-            self.planet_scatter = None
-
         if not stars and not planets and not deep_sky:
+            self.star_scatter = self._set_scatter(self.star_scatter, _EMPTY_POS, _EMPTY_SIZE, _STAR_COLOR)
+            self.planet_scatter = self._set_scatter(self.planet_scatter, _EMPTY_POS, _EMPTY_SIZE, _STAR_COLOR)
             self._stars_cache = []
             self._planets_cache = []
             self._dso_cache = []
+            self._star_arrays = StarArrays.from_stars([])
+            self._star_pos = np.zeros((0, 3), dtype=np.float32)
+            self._star_ids_sorted = np.empty(0, dtype=np.int64)
+            self._star_id_rows = np.empty(0, dtype=np.intp)
             return
 
-        # Filter visible stars (alt > 0)
-        visible_stars = [s for s in stars if s.alt_deg > 0.0]
+        # Filter visible stars (alt > 0) with one mask over the star columns
+        stars = stars if stars is not None else []
+        if star_arrays is None or len(star_arrays) != len(stars):
+            star_arrays = StarArrays.from_stars(stars)
+        keep = np.flatnonzero(star_arrays.alt_deg > 0.0)
+        if keep.shape[0] == len(stars):
+            # snapshots already hold only stars above the horizon: use the
+            # list and columns as given instead of copying them
+            visible_stars = stars
+            arrays = star_arrays
+        else:
+            visible_stars = [stars[i] for i in keep.tolist()]
+            arrays = star_arrays.take(keep)
+        self._star_arrays = arrays
+        self._star_id_rows = np.argsort(arrays.ids, kind='stable')
+        self._star_ids_sorted = arrays.ids[self._star_id_rows]
         visible_planets = [p for p in planets if p.alt_deg > 0.0]
         visible_dso = [d for d in deep_sky if getattr(d, 'alt_deg', -1) > 0.0] if self.show_dso else []
 
@@ -200,201 +438,212 @@ class SkyView3D(QtWidgets.QWidget):
         self._planets_cache = visible_planets
         self._dso_cache = visible_dso
 
+        # Stars and planets share one trig pass; each scatter gets a row slice
+        n_stars = len(arrays)
+        planet_alt, planet_az = self._altaz_columns(visible_planets)
+        n_total = n_stars + len(visible_planets)
+        if self._pos_buf.shape[0] < n_total:
+            self._pos_buf = np.empty((max(n_total, 2 * self._pos_buf.shape[0]), 3), dtype=np.float32)
+        pos_all = self._altaz_to_xyz(np.concatenate((arrays.alt_deg, planet_alt), dtype=np.float32),
+                                     np.concatenate((arrays.az_deg, planet_az), dtype=np.float32),
+                                     out=self._pos_buf[:n_total])
+        self._star_pos = pos_all[:n_stars]
+
         # Render stars
         if visible_stars:
-            # Convert to 3D
-            alt = np.array([s.alt_deg for s in visible_stars], dtype=float)
-            az = np.array([s.az_deg for s in visible_stars], dtype=float)
-            mag = np.array([s.mag for s in visible_stars], dtype=float)
-
-            x, y, z = self._altaz_to_xyz(alt, az)
-            pos = np.column_stack([x, y, z])
-
-            # Map magnitude to size and color
-            sizes = np.array([self._mag_to_size(m) for m in mag])
-            colors = np.ones((len(visible_stars), 4))
-            colors[:, :3] = 1.0  # White
-            colors[:, 3] = 1.0   # Fully opaque
-
-            # Create and add scatter
-            self.star_scatter = GLScatterPlotItem(
-                pos=pos,
-                size=sizes,
-                color=colors,
-                pxMode=False
-            )
-            self.glview.addItem(self.star_scatter)
-        
+            mag = arrays.mag
+            pos = self._star_pos
+
+            # Map magnitude to size (same mapping as _mag_to_size, whole array at once)
+            if self._size_buf.shape[0] < n_stars:
+                self._size_buf = np.empty(max(n_stars, 2 * self._size_buf.shape[0]), dtype=np.float32)
+            sizes = self._size_buf[:n_stars]
+            np.subtract(6.0, mag, out=sizes)
+            sizes *= 2.0
+            np.clip(sizes, 1.0, 12.0, out=sizes)
+
+            self.star_scatter = self._set_scatter(self.star_scatter, pos, sizes, _STAR_COLOR)
+        else:
+            self.star_scatter = self._set_scatter(self.star_scatter, _EMPTY_POS, _EMPTY_SIZE, _STAR_COLOR)
+
         # Render planets
         if visible_planets:
-            # Convert to 3D
-            alt = np.array([p.alt_deg for p in visible_planets], dtype=float)
-            az = np.array([p.az_deg for p in visible_planets], dtype=float)
-
-            x, y, z = self._altaz_to_xyz(alt, az)
-            pos = np.column_stack([x, y, z])
+            pos = pos_all[n_stars:]
 
             # Planets: larger, yellow; Moon slightly larger and bluish
-            sizes = np.ones(len(visible_planets)) * 0.15
-            colors = np.ones((len(visible_planets), 4))
-            colors[:, 0] = 1.0   # R: full
-            colors[:, 1] = 1.0   # G: full
-            colors[:, 2] = 0.0   # B: none (yellow)
-            colors[:, 3] = 1.0   # Fully opaque
-            for idx, p in enumerate(visible_planets):
-                if getattr(p, 'name', '').lower() == 'moon':
-                    sizes[idx] = 0.2
-                    colors[idx] = (0.8, 0.8, 1.0, 1.0)
-
-            # Create and add scatter
-            self.planet_scatter = GLScatterPlotItem(
-                pos=pos,
-                size=sizes,
-                color=colors,
-                pxMode=False
+            sizes = np.full(len(visible_planets), 9.0, dtype=np.float32)
+            moon = [idx for idx, p in enumerate(visible_planets) if getattr(p, 'name', '').lower() == 'moon']
+            if not moon:
+                colors = _PLANET_COLOR
+            else:
+                # the Moon differs, so colours go per point
+                n = len(visible_planets)
+                if self._planet_color_buf.shape[0] < n:
+                    self._planet_color_buf = np.empty((max(n, 2 * self._planet_color_buf.shape[0]), 4), dtype=np.float32)
+                colors = self._planet_color_buf[:n]
+                colors[:] = _PLANET_COLOR
+                colors[moon] = _MOON_COLOR
+            sizes[moon] = 12.0
+
+            self.planet_scatter = self._set_scatter(self.planet_scatter, pos, sizes, colors)
+        else:
+            self.planet_scatter = self._set_scatter(self.planet_scatter, _EMPTY_POS, _EMPTY_SIZE, _STAR_COLOR)
+
+    def _refresh_overlay_labels(self):
+        """Rebuild the overlay labels from the cached visible objects.
+
+        Run by `_flush` after star updates and label toggles, and by the
+        resize timer; neither of the latter needs the GL items rebuilt.
+        """
+        stars = self._stars_cache
+        try:
+            # Ensure overlay fills the widget
+            self._overlay.setGeometry(self.glview.geometry())
+            w = max(10, self._overlay.width())
+            h = max(10, self._overlay.height())
+
+            # Skip the rebuild when neither the view nor the labelled objects
+            # moved; hashing the star columns is far cheaper than placement
+            arrays = self._star_arrays
+            key = (
+                w, h, self.show_star_labels, self.show_planet_labels, self.show_dso,
+                self._label_density_index,
+                hash(arrays.ids.tobytes()), hash(arrays.alt_deg.tobytes()), hash(arrays.az_deg.tobytes()),
+                tuple((p.name, p.alt_deg, p.az_deg, getattr(p, 'phase_fraction', None)) for p in self._planets_cache),
+                tuple((d.name, d.alt_deg, d.az_deg) for d in self._dso_cache),
             )
-            self.glview.addItem(self.planet_scatter)
+            if key == self._overlay_key:
+                return
+            self._overlay_key = None
 
-        # Update overlay labels (use dome-like projection onto overlay)
-        try:
             # Clear existing overlay labels
-            for lab in self._overlay_labels:
-                try:
-                    lab.setParent(None)
-                except Exception:
-                    pass
-            self._overlay_labels = []
+            self._overlay.set_labels([])
             self._overlay_label_positions = []
 
             if self.show_star_labels or self.show_planet_labels:
-                # Ensure overlay fills the widget
-                self._overlay.setGeometry(self.glview.geometry())
-                w = max(10, self._overlay.width())
-                h = max(10, self._overlay.height())
 
                 # Build candidates in pixel coords
                 candidates = []
                 if self.show_star_labels:
-                    max_star_labels = [5, 15, 40][self._label_density_index if hasattr(self, '_label_density_index') else 1]
-                    bright = []
-                    for s in visible_stars:
-                        try:
-                            if hasattr(s, 'mag') and s.mag < 6.0:
-                                px, py = self._compute_screen_coords_for_altaz(s.alt_deg, s.az_deg, w, h)
-                                priority = 1 if s.mag < 2.0 else 2
-                                bright.append({'id': s.id, 'px': px, 'py': py, 'text': s.name, 'priority': priority, 'mag': s.mag})
-                        except Exception:
-                            continue
-                    bright.sort(key=lambda c: c.get('mag', 99.0))
-                    candidates.extend(bright[:max_star_labels])
+                    max_star_labels = [5, 15, 40][self._label_density_index]
+                    # mask the magnitude column, then keep the brightest (stable order)
+                    mag = self._star_arrays.mag
+                    idx = np.flatnonzero(mag < 6.0)
+                    idx = idx[np.argsort(mag[idx], kind='stable')][:max_star_labels]
+                    star_px, star_py = self._compute_screen_coords_batch(self._star_arrays.alt_deg[idx], self._star_arrays.az_deg[idx], w, h)
+                    priorities = np.where(mag[idx] < 2.0, 1, 2)
+                    for i, px, py, priority in zip(idx.tolist(), star_px.tolist(), star_py.tolist(), priorities.tolist()):
+                        s = stars[i]
+                        candidates.append((priority, s.mag, len(candidates), px, py, s.name, s.id))
                 if self.show_planet_labels:
-                    for p in visible_planets:
-                        try:
-                            px, py = self._compute_screen_coords_for_altaz(p.alt_deg, p.az_deg, w, h)
-                            text = p.name
-                            if getattr(p, 'name', '').lower() == 'moon' and getattr(p, 'phase_fraction', None) is not None:
-                                text = f"{p.name} ({int(p.phase_fraction*100)}%)"
-                            candidates.append({'id': getattr(p, 'name', None), 'px': px, 'py': py, 'text': text, 'priority': 0})
-                        except Exception:
-                            continue
+                    planet_px, planet_py = self._compute_screen_coords_batch(*self._altaz_columns(self._planets_cache), w, h)
+                    for p, px, py in zip(self._planets_cache, planet_px.tolist(), planet_py.tolist()):
+                        text = p.name
+                        if getattr(p, 'name', '').lower() == 'moon' and getattr(p, 'phase_fraction', None) is not None:
+                            text = f"{p.name} ({int(p.phase_fraction*100)}%)"
+                        candidates.append((0, 0, len(candidates), px, py, text, getattr(p, 'name', None)))
                 if self.show_dso:
-                    max_dso_labels = [0, 5, 15][self._label_density_index if hasattr(self, '_label_density_index') else 1]
-                    for d in visible_dso[:max_dso_labels]:
-                        try:
-                            px, py = self._compute_screen_coords_for_altaz(d.alt_deg, d.az_deg, w, h)
-                            candidates.append({'id': d.name, 'px': px, 'py': py, 'text': d.name, 'priority': 3})
-                        except Exception:
-                            continue
+                    max_dso_labels = [0, 5, 15][self._label_density_index]
+                    dso_shown = self._dso_cache[:max_dso_labels]
+                    dso_px, dso_py = self._compute_screen_coords_batch(*self._altaz_columns(dso_shown), w, h)
+                    for d, px, py in zip(dso_shown, dso_px.tolist(), dso_py.tolist()):
+                        candidates.append((3, 0, len(candidates), px, py, d.name, d.name))
                 # Compass labels at horizon (low priority but always placed)
-                compass = [('N', 0), ('E', 90), ('S', 180), ('W', 270)]
-                for lbl, az in compass:
-                    px, py = self._compute_screen_coords_for_altaz(0.0, az, w, h)
-                    candidates.append({'id': f'compass_{lbl}', 'px': px, 'py': py, 'text': lbl, 'priority': 4})
+                compass = ['N', 'E', 'S', 'W']
+                compass_px, compass_py = self._compute_screen_coords_batch(np.zeros(4), np.array([0.0, 90.0, 180.0, 270.0]), w, h)
+                for lbl, px, py in zip(compass, compass_px.tolist(), compass_py.tolist()):
+                    candidates.append((4, 0, len(candidates), px, py, lbl, f'compass_{lbl}'))
 
-                # Font used both for overlay QLabel sizing and export consistency
-                font = QtGui.QFont()
-                font.setPointSize(max(8, int(min(w, h) / 200)))
+                # Font used both for overlay label sizing and export consistency
+                font = self._label_font(w, h)
 
                 placed = self._place_labels_greedy_pixels(candidates, w, h, font)
 
-                # Create QLabel overlays and record positions for export
-                for pl in placed:
-                    try:
-                        lbl = QtWidgets.QLabel(self._overlay)
-                        lbl.setText(pl['text'])
-                        # color planets differently if source indicates priority 0
-                        if pl['src'].get('priority', 10) == 0:
-                            lbl.setStyleSheet('color: rgb(255,220,80); background: rgba(0,0,0,0);')
-                        elif pl['src'].get('priority', 10) == 3:
-                            lbl.setStyleSheet('color: rgb(120,180,255); background: rgba(0,0,0,0);')
-                        else:
-                            lbl.setStyleSheet('color: rgb(220,220,255); background: rgba(0,0,0,0);')
-                        lbl.setFont(font)
-                        lbl.move(int(pl['x']), int(pl['y']))
-                        lbl.show()
-                        self._overlay_labels.append(lbl)
-                        # Save exact draw positions for export (top-left)
-                        self._overlay_label_positions.append({'x': int(pl['x']), 'y': int(pl['y']), 'text': pl['text'], 'priority': pl['src'].get('priority', 10)})
-                    except Exception:
-                        continue
+                # Hand all labels to the overlay (one paint pass) and record
+                # their top-left positions for export
+                self._overlay_label_positions = [
+                    {'x': int(pl['x']), 'y': int(pl['y']), 'text': pl['text'], 'priority': pl['priority']}
+                    for pl in placed
+                ]
+                self._overlay.set_labels(
+                    [(lbl['x'], lbl['y'], lbl['text'], _LABEL_COLORS.get(lbl['priority'], _LABEL_COLOR_DEFAULT))
+                     for lbl in self._overlay_label_positions],
+                    font,
+                )
+            self._overlay_key = key
         except Exception:
             # Non-critical: overlay labels are best-effort
-            pass
+            logger.debug("3D overlay label refresh failed", exc_info=True)
+
+    def _rows_for_ids(self, ids: np.ndarray) -> np.ndarray:
+        """Rows of the visible stars with the given ids (-1 where not visible)."""
+        ids_sorted = self._star_ids_sorted
+        if ids_sorted.shape[0] == 0:
+            return np.full(ids.shape, -1, dtype=np.intp)
+        at = np.minimum(np.searchsorted(ids_sorted, ids), ids_sorted.shape[0] - 1)
+        return np.where(ids_sorted[at] == ids, self._star_id_rows[at], -1)
+
+    def set_constellation_segments(self, segments):
+        """Store the segments to draw as an (M, 2) star-id table.
+
+        `segments` is either a list of (star1, star2) tuples or an (M, 2)
+        array of star ids (see ``constellations.constellation_edge_ids``).
+        Passing the same object again keeps the existing table.
+        """
+        if segments is self._segments:
+            return
+        self._segments = segments
+        if isinstance(segments, np.ndarray):
+            self._seg_ids = segments.astype(np.int64, copy=False).reshape(-1, 2)
+        else:
+            self._seg_ids = np.fromiter((s.id for pair in segments for s in pair), dtype=np.int64,
+                                        count=2 * len(segments)).reshape(-1, 2)
+
+    def redraw_constellations(self):
+        """Draw the stored constellation segments whose stars are both visible."""
+        if not self._stars_cache or not self._seg_ids.shape[0]:
+            self._constellation_lines_item.setData(pos=_EMPTY_POS)
+            return
 
-    def update_constellations(self, segments: list):
+        # Star positions come from update_sky; gather rows by star id
+        rows = self._rows_for_ids(self._seg_ids)
+        kernel = segment_assembly_kernel() if rows.shape[0] >= _SEGMENT_KERNEL_MIN else None
+        if kernel is not None:
+            seg_xyz = np.empty((2 * rows.shape[0], 3), dtype=np.float32)
+            seg_xyz = seg_xyz[:kernel(self._star_pos, rows, seg_xyz)]
+        else:
+            rows = rows[(rows >= 0).all(axis=1)]
+            seg_xyz = self._star_pos[rows.ravel()]
+
+        # One vertex pair per segment, all drawn by the persistent 'lines' item
+        assert seg_xyz.dtype == np.float32 and seg_xyz.flags.c_contiguous
+        self._constellation_lines_item.setData(pos=seg_xyz)
+
+    def update_constellations(self, segments):
         """Draw constellation lines between visible star pairs.
 
-        `segments` is a list of (star1, star2) tuples.
+        `segments` is a list of (star1, star2) tuples or an (M, 2) star-id
+        array; pairs with a star below the horizon are skipped.
         """
-        # Remove old constellation lines
-        for line in self.constellation_lines:
-            try:
-                self.glview.removeItem(line)
-            except Exception:
-                pass
-        self.constellation_lines = []
-
-        if not self._stars_cache or not segments:
-            return
-
-        # Build star position map
-        star_pos = {}
-        for s in self._stars_cache:
-            x, y, z = self._altaz_to_xyz(np.array([s.alt_deg]), np.array([s.az_deg]))
-            star_pos[s.id] = np.array([x[0], y[0], z[0]])
-
-        # Draw lines for available segments
-        for s1, s2 in segments:
-            p1 = star_pos.get(s1.id)
-            p2 = star_pos.get(s2.id)
-            if p1 is None or p2 is None:
-                continue
-
-            # Create a line connecting the two stars
-            pts = np.array([p1, p2])
-            line = GLLinePlotItem(
-                pos=pts,
-                color=(0.7, 0.7, 1.0, 0.3),  # Faint blue
-                width=1,
-                antialias=True
-            )
-            self.glview.addItem(line)
-            self.constellation_lines.append(line)
+        self.set_constellation_segments(segments)
+        self._schedule(_DIRTY_CONSTELLATIONS)
 
     def export_png(self, path, width: int = 2000, height: int = 2000):
         """Export the current 3D view to a high-resolution PNG.
 
-        Renders the GLViewWidget to an image at the requested size.
+        Renders the GLViewWidget offscreen at the requested size (tiled
+        through a framebuffer object by pyqtgraph), leaving the live widget
+        untouched.
         """
-        # Resize the widget temporarily for high-res rendering
-        old_size = self.glview.size()
-        self.glview.resize(width, height)
-
-        # Grab the framebuffer
-        pm = self.glview.grabFramebuffer()
-
-        # Restore size
-        self.glview.resize(old_size)
+        if self._dirty:
+            self._flush()
+        # renderToArray needs a live GL context; without one it would crash
+        if not self.glview.isValid():
+            raise RuntimeError("OpenGL context unavailable; cannot export the 3D view")
+        # BGRA bytes per pixel are QImage's ARGB32 layout on little-endian
+        # hosts; copy so the image owns its pixels
+        arr = self.glview.renderToArray((width, height))
+        pm = QtGui.QImage(arr.data, width, height, width * 4, QtGui.QImage.Format_ARGB32).copy()
 
         # Composite labels onto pixmap if enabled
         if (self.show_star_labels or self.show_planet_labels or self.show_dso) and self._stars_cache is not None:
@@ -403,60 +652,48 @@ class SkyView3D(QtWidgets.QWidget):
                 painter.setRenderHint(QtGui.QPainter.Antialiasing)
                 w = pm.width()
                 h = pm.height()
-                cx = w / 2.0
-                cy = h / 2.0
-                scale = 0.45 * min(w, h)
-                font = QtGui.QFont()
-                font.setPointSize(max(8, int(min(w, h) / 200)))
+                font = self._label_font(w, h)
                 painter.setFont(font)
 
+                # Glyph layouts are kept per text across exports (for one font);
+                # (x, y) below is the text baseline, as for drawText
+                if font is not self._static_text_font:
+                    self._static_text_font = font
+                    self._static_text_cache = {}
+                cache = self._static_text_cache
+                ascent = QtGui.QFontMetrics(font).ascent()
+
+                def _draw(x, y, text):
+                    st = cache.get(text)
+                    if st is None:
+                        st = cache[text] = QtGui.QStaticText(text)
+                        st.setTextFormat(Qt.PlainText)
+                        st.prepare(QtGui.QTransform(), font)
+                    painter.drawStaticText(x, y - ascent, st)
+
                 # If we have cached overlay positions (from update_sky), use them to
                 # draw text so exports match on-screen overlay.
                 if getattr(self, '_overlay_label_positions', None):
                     for lbl in self._overlay_label_positions:
-                        try:
-                            if lbl.get('priority', 10) == 0:
-                                painter.setPen(QtGui.QColor(255, 220, 80))
-                            elif lbl.get('priority', 10) == 3:
-                                painter.setPen(QtGui.QColor(120, 180, 255))
-                            else:
-                                painter.setPen(QtGui.QColor(220, 220, 255))
-                            painter.drawText(int(lbl['x']), int(lbl['y']), lbl['text'])
-                        except Exception:
-                            continue
+                        painter.setPen(_LABEL_COLORS.get(lbl.get('priority', 10), _LABEL_COLOR_DEFAULT))
+                        _draw(int(lbl['x']), int(lbl['y']), lbl['text'])
                 else:
                     # Fallback: approximate positions directly from alt/az
                     if self.show_star_labels:
-                        painter.setPen(QtGui.QColor(220, 220, 255))
-                        for s in self._stars_cache:
-                            try:
-                                if hasattr(s, 'mag') and s.mag < 2.0:
-                                    az_rad = np.radians(s.az_deg)
-                                    r = float(np.clip((90.0 - s.alt_deg) / 90.0, 0.0, 1.0))
-                                    x = r * np.sin(az_rad)
-                                    y = r * np.cos(az_rad)
-                                    px = int(cx + scale * x)
-                                    py = int(cy - scale * y)
-                                    painter.drawText(px + 6, py - 6, s.name)
-                            except Exception:
-                                continue
+                        painter.setPen(_LABEL_COLOR_DEFAULT)
+                        idx = np.flatnonzero(self._star_arrays.mag < 2.0)
+                        star_px, star_py = self._compute_screen_coords_batch(self._star_arrays.alt_deg[idx], self._star_arrays.az_deg[idx], w, h)
+                        for i, px, py in zip(idx.tolist(), star_px.tolist(), star_py.tolist()):
+                            _draw(px + 6, py - 6, self._stars_cache[i].name)
 
                     if self.show_planet_labels:
-                        painter.setPen(QtGui.QColor(255, 220, 80))
-                        for p in self._planets_cache:
-                            try:
-                                az_rad = np.radians(p.az_deg)
-                                r = float(np.clip((90.0 - p.alt_deg) / 90.0, 0.0, 1.0))
-                                x = r * np.sin(az_rad)
-                                y = r * np.cos(az_rad)
-                                px = int(cx + scale * x)
-                                py = int(cy - scale * y)
-                                label = p.name
-                                if getattr(p, 'name', '').lower() == 'moon' and getattr(p, 'phase_fraction', None) is not None:
-                                    label = f"{p.name} ({int(p.phase_fraction*100)}%)"
-                                painter.drawText(px + 6, py - 6, label)
-                            except Exception:
-                                continue
+                        painter.setPen(_LABEL_COLORS[0])
+                        planet_px, planet_py = self._compute_screen_coords_batch(*self._altaz_columns(self._planets_cache), w, h)
+                        for p, px, py in zip(self._planets_cache, planet_px.tolist(), planet_py.tolist()):
+                            label = p.name
+                            if getattr(p, 'name', '').lower() == 'moon' and getattr(p, 'phase_fraction', None) is not None:
+                                label = f"{p.name} ({int(p.phase_fraction*100)}%)"
+                            _draw(px + 6, py - 6, label)
 
                 painter.end()
             except Exception:
@@ -467,19 +704,16 @@ class SkyView3D(QtWidgets.QWidget):
 
     def set_show_star_labels(self, flag: bool):
         self.show_star_labels = bool(flag)
-        # Trigger label overlay update if we have data cached
-        if self._stars_cache or self._planets_cache:
-            self.update_sky(self._stars_cache, self._planets_cache)
+        # Only the overlay changes; the GL items stay as they are
+        self._schedule(_DIRTY_LABELS)
 
     def set_show_planet_labels(self, flag: bool):
         self.show_planet_labels = bool(flag)
-        if self._stars_cache or self._planets_cache:
-            self.update_sky(self._stars_cache, self._planets_cache)
+        self._schedule(_DIRTY_LABELS)
 
     def set_label_density(self, idx: int):
         self._label_density_index = max(0, min(int(idx), 2))
-        if self._stars_cache or self._planets_cache:
-            self.update_sky(self._stars_cache, self._planets_cache, self._dso_cache)
+        self._schedule(_DIRTY_LABELS)
 
     def set_overlays(self, ra_dec: bool, alt_az: bool, ecliptic: bool, meridian: bool):
         self.show_ra_dec_grid = bool(ra_dec)
@@ -494,9 +728,8 @@ class SkyView3D(QtWidgets.QWidget):
             pass
         try:
             self._overlay.setGeometry(self.glview.geometry())
-            if getattr(self, '_stars_cache', None) or getattr(self, '_planets_cache', None):
-                # Recompute placements using cached data
-                self.update_sky(self._stars_cache, self._planets_cache)
+            # Recompute placements once the resize drag settles
+            self._overlay_timer.start(50)
         except Exception:
             pass
 
@@ -505,31 +738,32 @@ class SkyView3D(QtWidgets.QWidget):
 
         Looks at stars, planets, and DSOs and returns nearest within tolerance.
         """
+        if self._dirty:
+            self._flush()
         w = max(10, self._overlay.width())
         h = max(10, self._overlay.height())
         best = None
-        best_dist = tol_px
-
-        def check(px, py, kind, obj):
-            nonlocal best, best_dist
+        # compare squared pixel distances; no sqrt per candidate
+        best_d2 = tol_px * tol_px
+
+        def check(objs, alt, az, kind_of):
+            nonlocal best, best_d2
+            if not objs:
+                return
+            px, py = self._compute_screen_coords_batch(alt, az, w, h)
             dx = screen_pos.x() - px
             dy = screen_pos.y() - py
-            dist = (dx * dx + dy * dy) ** 0.5
-            if dist < best_dist:
-                best_dist = dist
-                best = (kind, obj)
+            d2 = dx * dx + dy * dy
+            i = int(np.argmin(d2))
+            if d2[i] < best_d2:
+                best_d2 = d2[i]
+                best = (kind_of(objs[i]), objs[i])
 
         # Stars
-        for s in self._stars_cache:
-            px, py = self._compute_screen_coords_for_altaz(s.alt_deg, s.az_deg, w, h)
-            check(px, py, 'star', s)
+        check(self._stars_cache, self._star_arrays.alt_deg, self._star_arrays.az_deg, lambda s: 'star')
         # Planets
-        for p in self._planets_cache:
-            px, py = self._compute_screen_coords_for_altaz(p.alt_deg, p.az_deg, w, h)
-            kind = 'moon' if getattr(p, 'name', '').lower() == 'moon' else 'planet'
-            check(px, py, kind, p)
+        check(self._planets_cache, *self._altaz_columns(self._planets_cache),
+              lambda p: 'moon' if getattr(p, 'name', '').lower() == 'moon' else 'planet')
         # Deep sky
-        for d in self._dso_cache:
-            px, py = self._compute_screen_coords_for_altaz(d.alt_deg, d.az_deg, w, h)
-            check(px, py, 'dso', d)
+        check(self._dso_cache, *self._altaz_columns(self._dso_cache), lambda d: 'dso')
         return best
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """Simple test runner for the Night Sky project.
 
-Runs unittest discovery in the `tests/` directory and returns a non-zero
+Runs the `tests/` directory in parallel with pytest-xdist when it is
+installed, otherwise falls back to unittest discovery. Returns a non-zero
 exit code if any test fails.
 """
 import sys
@@ -9,6 +10,13 @@ import unittest
 
 
 def main():
+    try:
+        import pytest
+        import xdist  # noqa: F401  (only checking that the plugin is present)
+    except ImportError:
+        pass
+    else:
+        return int(pytest.main(['-n', 'auto', 'tests']) != 0)
     loader = unittest.TestLoader()
     tests = loader.discover('tests')
     runner = unittest.TextTestRunner(verbosity=2)
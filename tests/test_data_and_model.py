@@ -1,6 +1,8 @@
 import unittest
 from datetime import datetime, timezone
 
+import numpy as np
+
 from night_sky.data_manager import load_bright_stars
 from night_sky.sky_model import SkyModel, SkySnapshot, Planet
 
@@ -66,6 +68,22 @@ class TestDataAndModel(unittest.TestCase):
         self.assertEqual(len(filtered), 1)
         self.assertEqual(filtered[0]['id'], 1)
 
+    def test_catalog_arrays_cached_per_limit(self):
+        sm = SkyModel(limiting_magnitude=6.0)
+        cat, ra, dec = sm._catalog_arrays(3.0)
+        self.assertEqual(ra.dtype, np.float32)
+        self.assertEqual(len(ra), len(cat))
+        self.assertIs(sm._catalog_arrays(3.0)[1], ra)
+        self.assertIsNot(sm._catalog_arrays(4.0)[1], ra)
+
+    def test_snapshot_star_arrays_parallel_to_stars(self):
+        snap = SkyModel().compute_snapshot(0.0, 0.0, datetime(2024, 1, 1, tzinfo=timezone.utc))
+        arrs = snap.star_arrays
+        self.assertEqual(len(arrs), len(snap.visible_stars))
+        for i, st in enumerate(snap.visible_stars[:20]):
+            self.assertAlmostEqual(float(arrs.az_mod360[i]), st.az_deg % 360.0, places=3)
+            self.assertAlmostEqual(float(arrs.zen_norm[i]), (90.0 - st.alt_deg) / 90.0, places=5)
+
 
 if __name__ == '__main__':
     unittest.main()
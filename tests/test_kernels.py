@@ -0,0 +1,80 @@
+import unittest
+
+import numpy as np
+
+from night_sky import kernels
+
+
+class TestKernels(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.az = rng.uniform(0, 360, 64).astype(np.float32)
+        self.alt = rng.uniform(-5, 90, 64).astype(np.float32)
+        self.mag = rng.uniform(-1.5, 8, 64).astype(np.float32)
+
+    def _check_dome(self, fn):
+        out = np.empty((3, 64), dtype=np.float32)
+        fn(self.az, self.alt, self.mag, 3.5, 2.0, 30.0, out[0], out[1], out[2])
+        r = np.clip((90.0 - self.alt) / 90.0, 0.0, 1.0)
+        np.testing.assert_allclose(out[0], r * np.sin(np.radians(self.az)), atol=1e-5)
+        np.testing.assert_allclose(out[1], r * np.cos(np.radians(self.az)), atol=1e-5)
+        np.testing.assert_allclose(out[2], np.clip((6.0 - self.mag) * 3.5, 2.0, 30.0), atol=1e-4)
+
+    def test_project_dome_reference(self):
+        self._check_dome(kernels._project_dome)
+
+    def test_project_dome_compiled(self):
+        kernel = kernels.dome_projection_kernel()
+        if kernel is None:
+            self.skipTest("numba not installed")
+        self._check_dome(kernel)
+
+    def _place(self, fn):
+        # four labels sharing one anchor (the last low priority) and one off-screen
+        px = np.array([100, 100, 100, 100, 500], dtype=np.int32)
+        py = np.array([100, 100, 100, 100, 100], dtype=np.int32)
+        w_text = np.array([40, 40, 40, 40, 40], dtype=np.int32)
+        priority = np.array([0, 1, 2, 4, 1], dtype=np.int32)
+        out = np.zeros((3, 5), dtype=np.int32)
+        n = fn(px, py, w_text, 10, priority, 200, 200, out[0], out[1], out[2])
+        return n, out
+
+    def test_place_greedy_reference(self):
+        n, out = self._place(kernels._place_greedy)
+        self.assertEqual(n, 4)
+        # first fits at the base offset, the next ones shift below it
+        self.assertEqual((out[0, 0], out[1, 0]), (106, 94))
+        self.assertEqual((out[0, 1], out[1, 1]), (106, 106))
+        self.assertEqual(out[2].tolist(), [1, 1, 1, 0, 1])
+        # off-screen priority-1 label is forced at its base position
+        self.assertEqual((out[0, 4], out[1, 4]), (506, 94))
+
+    def test_place_greedy_compiled(self):
+        kernel = kernels.greedy_placement_kernel()
+        if kernel is None:
+            self.skipTest("numba not installed")
+        n_ref, out_ref = self._place(kernels._place_greedy)
+        n, out = self._place(kernel)
+        self.assertEqual(n, n_ref)
+        np.testing.assert_array_equal(out, out_ref)
+
+    def _check_segments(self, fn):
+        rng = np.random.default_rng(1)
+        pos = rng.random((50, 3)).astype(np.float32)
+        rows = rng.integers(-1, 50, (200, 2))
+        out = np.empty((400, 3), dtype=np.float32)
+        n = fn(pos, rows, out)
+        np.testing.assert_array_equal(out[:n], pos[rows[(rows >= 0).all(axis=1)].ravel()])
+
+    def test_assemble_segments_reference(self):
+        self._check_segments(kernels._assemble_segments)
+
+    def test_assemble_segments_compiled(self):
+        kernel = kernels.segment_assembly_kernel()
+        if kernel is None:
+            self.skipTest("numba not installed")
+        self._check_segments(kernel)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,8 @@
 import unittest
 import os
+import subprocess
+import sys
+import tempfile
 from pathlib import Path
 
 from night_sky import prefs
@@ -7,23 +10,18 @@ from night_sky import prefs
 
 class TestPrefs(unittest.TestCase):
     def setUp(self):
-        # Use the real config path but back it up if exists
+        # Redirect prefs to a scratch dir so tests never touch ~/.night_sky
+        # and can run in parallel workers.
+        self._tmp = tempfile.TemporaryDirectory()
+        self._saved = (prefs.CONFIG_DIR, prefs.CONFIG_PATH, prefs._dir_ready)
+        prefs.CONFIG_DIR = Path(self._tmp.name) / '.night_sky'
+        prefs.CONFIG_PATH = prefs.CONFIG_DIR / 'prefs.json'
+        prefs._dir_ready = False
         self.config_path = prefs.CONFIG_PATH
-        self.backup_path = None
-        if self.config_path.exists():
-            self.backup_path = self.config_path.with_suffix('.bak')
-            self.config_path.replace(self.backup_path)
 
     def tearDown(self):
-        # Remove config created during test
-        try:
-            if self.config_path.exists():
-                self.config_path.unlink()
-        except Exception:
-            pass
-        # Restore backup
-        if self.backup_path and self.backup_path.exists():
-            self.backup_path.replace(self.config_path)
+        prefs.CONFIG_DIR, prefs.CONFIG_PATH, prefs._dir_ready = self._saved
+        self._tmp.cleanup()
 
     def test_save_and_load_prefs_roundtrip(self):
         test_prefs = {
@@ -50,6 +48,28 @@ class TestPrefs(unittest.TestCase):
         self.assertEqual(int(loaded.get('export_default_size')), 2500)
         self.assertAlmostEqual(float(loaded.get('limiting_magnitude')), 5.5)
 
+    def test_debounced_save_is_flushed_by_load(self):
+        """Run the debounce-then-load scenario in a fresh process to isolate Qt state."""
+        script = """
+from PyQt5 import QtWidgets
+from night_sky import prefs
+app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+prefs.save_prefs_debounced({'lat_deg': 1.0}, delay_ms=10000)
+prefs.save_prefs_debounced({'lat_deg': 2.5}, delay_ms=10000)
+assert not prefs.CONFIG_PATH.exists()
+loaded = prefs.load_prefs()
+assert abs(float(loaded.get('lat_deg')) - 2.5) < 1e-9
+"""
+        with tempfile.TemporaryDirectory() as home:
+            # point ~ at a scratch dir so the child never touches real prefs
+            env = os.environ.copy()
+            env.setdefault("QT_QPA_PLATFORM", "offscreen")
+            env["HOME"] = env["USERPROFILE"] = home
+            result = subprocess.run([sys.executable, "-c", script], env=env)
+            self.assertEqual(result.returncode, 0)
+            # the pending save was written when load_prefs flushed it
+            self.assertTrue((Path(home) / '.night_sky' / 'prefs.json').exists())
+
 
 if __name__ == '__main__':
     unittest.main()